@@ -1,17 +1,26 @@
 from __future__ import annotations
 
-import base64
 import os
+import re
 import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
-from backend.app.deps import verify_api_key
+from backend.app.deps import use_response_cache, verify_api_key
 from backend.config import logger
 from backend.core.config import settings
+from backend.utils.cache import TTLCache, request_cache_key
+
+try:
+    import pybase64 as _b64  # SIMD-accelerated, drop-in for the stdlib module
+except Exception:
+    import base64 as _b64
 
 try:
     import google.generativeai as genai
@@ -20,6 +29,25 @@ except Exception:
 
 router = APIRouter()
 
+# base64 window fed to the decoder when streaming PDFs to disk (multiple of 4)
+_B64_CHUNK = 64 * 1024
+# ASCII that b64decode(validate=False) discards (whitespace, url-safe chars, stray punctuation);
+# non-ASCII is left in so the decoder still rejects it
+_B64_JUNK_RE = re.compile(r"[^A-Za-z0-9+/=\x80-\U0010ffff]+")
+
+# shared pool so multiple PDF uploads overlap with each other and with content assembly
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gemini-upload")
+_UPLOAD_ATTEMPTS = 3
+
+# generateContent-capable models (short name -> full id), shared by all chat services
+_available_cache = TTLCache(ttl_seconds=300)
+
+# interned GenerativeModel wrappers, keyed by full model id
+_MODEL_INSTANCES: Dict[str, Any] = {}
+
+# identical chat requests -> ChatResponse (opt-in via X-Cache header)
+_reply_cache = TTLCache(ttl_seconds=300)
+
 
 class ChatAttachment(BaseModel):
     filename: Optional[str] = None
@@ -54,13 +82,17 @@ class GeminiChatService:
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY not configured")
 
+        self._api_key = api_key
         self._requested_model = model
         self._model_id = None  # full model id (e.g., models/gemini-2.0-flash-001)
         self._client = None
         self._configure(api_key)
 
-    def _configure(self, api_key: str) -> None:
-        genai.configure(api_key=api_key)
+    @staticmethod
+    def _available_models(api_key: str) -> Dict[str, str]:
+        cached = _available_cache.get(api_key)
+        if cached:
+            return cached
 
         # Normalize & find a supported model
         available_map: Dict[str, str] = {}
@@ -73,6 +105,22 @@ class GeminiChatService:
         except Exception as e:
             logger.error(f"Gemini list_models failed: {e}")
 
+        if available_map:
+            _available_cache.set(api_key, available_map)
+        return available_map
+
+    def _configure(self, api_key: str) -> None:
+        genai.configure(api_key=api_key)
+        self._select_model()
+
+    def _select_model(self) -> Any:
+        """
+        Resolve the preferred available model through the shared TTL cache and return its client.
+        Runs on every request (the service itself is long-lived), so a refreshed model list is picked up;
+        if the refresh comes back empty the current model is kept.
+        """
+        available_map = self._available_models(self._api_key)
+
         # preferred → fallbacks
         candidates = [
             self._requested_model,
@@ -87,30 +135,91 @@ class GeminiChatService:
                 chosen_short = c
                 break
         if not chosen_short:
+            if self._client is not None:
+                return self._client
             raise RuntimeError(f"No suitable Gemini model found. Available: {sorted(available_map.keys())}")
 
-        self._model_id = available_map[chosen_short]
-        self._client = genai.GenerativeModel(self._model_id)
-        logger.info(f"Gemini chat configured with: {chosen_short} ({self._model_id})")
+        model_id = available_map[chosen_short]
+        if model_id == self._model_id:
+            return self._client
+        client = _MODEL_INSTANCES.get(model_id)
+        if client is None:
+            client = _MODEL_INSTANCES[model_id] = genai.GenerativeModel(model_id)
+        self._model_id, self._client = model_id, client
+        logger.info(f"Gemini chat configured with: {chosen_short} ({model_id})")
+        return client
 
     @staticmethod
     def _strip_data_url(b64: str) -> str:
         if not b64:
             return b64
-        if "," in b64 and b64.strip().startswith("data:"):
-            return b64.split(",", 1)[1]
+        # Only the head can hold a data: prefix; avoid strip()/split() copies of the whole payload
+        if b64[:64].lstrip().startswith("data:"):
+            comma = b64.find(",", 0, 256)
+            if comma >= 0:
+                return b64[comma + 1:]
         return b64
 
-    def _build_content(
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        # os.write may write less than asked
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+
+    @classmethod
+    def _decode_to_fd(cls, b64: str, fd: int) -> None:
+        """
+        Decode base64 straight into `fd` window by window so the full PDF is never held in memory.
+        Writes exactly what b64decode(b64) would return: non-alphabet characters are dropped before
+        the 4-character split and a partial quad is carried into the next window.
+        """
+        carry = ""
+        for i in range(0, len(b64), _B64_CHUNK):
+            chunk = carry + _B64_JUNK_RE.sub("", b64[i:i + _B64_CHUNK])
+            if "=" in chunk:
+                # padding is where b64decode stops; hand it the rest so its semantics apply unchanged
+                cls._write_all(fd, _b64.b64decode(chunk + b64[i + _B64_CHUNK:], validate=False))
+                return
+            cut = len(chunk) - (len(chunk) % 4)
+            cls._write_all(fd, _b64.b64decode(chunk[:cut], validate=False))
+            carry = chunk[cut:]
+        if carry:
+            cls._write_all(fd, _b64.b64decode(carry, validate=False))
+
+    @classmethod
+    def _upload_pdf(cls, b64: str) -> Any:
+        """Write the PDF to a temp file and upload it, retrying with exponential backoff."""
+        # raw fd writes: no Python-level file buffer between the decoder and the page cache
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            try:
+                cls._decode_to_fd(b64, fd)
+            finally:
+                os.close(fd)
+            for attempt in range(_UPLOAD_ATTEMPTS):
+                try:
+                    return genai.upload_file(path=path, mime_type="application/pdf")
+                except Exception as e:
+                    if attempt == _UPLOAD_ATTEMPTS - 1:
+                        raise
+                    logger.warning(f"Gemini upload_file failed (attempt {attempt + 1}): {e}")
+                    time.sleep(2 ** attempt)
+        finally:
+            try:
+                os.remove(path)
+            except Exception:
+                pass
+
+    def _build_context_parts(
             self,
-            message: str,
             context: Optional[str],
             attachments: List[ChatAttachment],
-            mode: str,
     ) -> List[Any]:
         """
-        Build Gemini content array. For PDFs we upload a temp file with genai.upload_file and
-        pass file references; for images we use inline_data.
+        Build the document part of the Gemini content array (everything but the user message).
+        For PDFs we upload a temp file with genai.upload_file and pass file references;
+        for images we use inline_data.
         """
         # 1) System / behavior prompt
         sys_doc = (
@@ -127,55 +236,28 @@ class GeminiChatService:
         if ctx_block:
             content.append(ctx_block)
 
-        # 3) Attachments
-        has_attachments = bool(attachments)
-        file_refs: List[Any] = []
-
-        if has_attachments:
-            for att in attachments:
-                mt = (att.mime_type or "").lower()
-                raw = base64.b64decode(self._strip_data_url(att.base64_data))
-
-                if mt.startswith("image/"):
-                    # Send inline for images
-                    content.append(
-                        {
-                            "inline_data": {
-                                "data": base64.b64encode(raw).decode("utf-8"),
-                                "mime_type": mt,
-                            }
-                        }
-                    )
-                elif mt == "application/pdf":
-                    # Upload temp file then reference it
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                        tmp.write(raw)
-                        tmp.flush()
-                        path = tmp.name
-                    try:
-                        f = genai.upload_file(path=path, mime_type="application/pdf")
-                        file_refs.append(f)
-                    finally:
-                        try:
-                            os.remove(path)
-                        except Exception:
-                            pass
-                else:
-                    # Unsupported mimetype → best effort as inline binary
-                    content.append(
-                        {
-                            "inline_data": {
-                                "data": base64.b64encode(raw).decode("utf-8"),
-                                "mime_type": mt or "application/octet-stream",
-                            }
-                        }
-                    )
-
-            # PDFs must be added as file references after upload
-            for f in file_refs:
-                content.append(f)
-
-        # 4) The user message
+        # 3) Attachments: normalize once, then handle each kind in its own tight loop
+        prepared = [((att.mime_type or "").lower(), self._strip_data_url(att.base64_data)) for att in attachments]
+        pdfs = [b64 for mt, b64 in prepared if mt == "application/pdf"]
+        inline = [(mt, b64) for mt, b64 in prepared if mt != "application/pdf"]
+
+        # Start PDF uploads first so they overlap with inline part assembly
+        file_refs: List[Future] = [_UPLOAD_POOL.submit(self._upload_pdf, b64) for b64 in pdfs]
+
+        for mt, b64 in inline:
+            if settings.VALIDATE_B64:
+                _b64.b64decode(b64, validate=True)  # raises on malformed payloads
+            # Images go inline as-is; unsupported mimetypes are sent best effort as inline binary.
+            # Either way the payload is already base64, so pass it through.
+            content.append({"inline_data": {"data": b64, "mime_type": mt or "application/octet-stream"}})
+
+        # PDFs must be added as file references after upload
+        content.extend(fut.result() for fut in file_refs)
+
+        return content
+
+    @staticmethod
+    def _user_block(message: str, mode: str, has_attachments: bool) -> str:
         if mode == "document" or (mode == "auto" and has_attachments):
             user_block = (
                 "User request (document chat mode):\n"
@@ -184,9 +266,7 @@ class GeminiChatService:
             )
         else:
             user_block = f"User request (general chat):\n{message}"
-
-        content.append(user_block)
-        return content
+        return user_block
 
     def generate(
             self,
@@ -196,8 +276,10 @@ class GeminiChatService:
             mode: str = "auto",
             temperature: float = 0.3,
     ) -> str:
-        content = self._build_content(message, context, attachments, mode)
-        resp = self._client.generate_content(
+        client = self._select_model()
+        content = self._build_context_parts(context, attachments)
+        content.append(self._user_block(message, mode, bool(attachments)))
+        resp = client.generate_content(
             content,
             generation_config={
                 "temperature": max(0.0, min(1.0, float(temperature))),
@@ -208,8 +290,17 @@ class GeminiChatService:
         return getattr(resp, "text", "") or ""
 
 
+@lru_cache(maxsize=8)
+def _get_service(api_key: str, model: str) -> GeminiChatService:
+    """
+    Reuse one configured service per (api_key, model) instead of rebuilding it per request.
+    The concrete model is still re-resolved per request from the TTL-cached listing (see _select_model).
+    """
+    return GeminiChatService(api_key=api_key, model=model)
+
+
 @router.post("", response_model=ChatResponse, dependencies=[Depends(verify_api_key)])
-async def chat(req: ChatRequest):
+async def chat(req: ChatRequest, cache: bool = Depends(use_response_cache)):
     """
     Gemini-powered chat endpoint.
     - If `attachments` are provided (or `mode="document"`), runs document chat.
@@ -225,8 +316,20 @@ async def chat(req: ChatRequest):
         logger.error("GEMINI_API_KEY not set")
         raise HTTPException(status_code=500, detail="GEMINI_API_KEY not configured")
 
+    cache_key = None
+    if cache:
+        cache_key = request_cache_key(
+            {"m": req.message, "ctx": req.context, "mode": req.mode or "auto",
+             "t": round(req.temperature or 0.3, 2),
+             "att": [(a.mime_type, a.filename) for a in req.attachments]},
+            [a.base64_data for a in req.attachments],
+        )
+        cached = _reply_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     try:
-        svc = GeminiChatService(api_key=api_key, model="gemini-2.0-flash-001")
+        svc = _get_service(api_key, "gemini-2.0-flash-001")
         # run blocking gen call in a thread so we don't block the event loop
         reply = await run_in_threadpool(
             svc.generate,
@@ -236,7 +339,10 @@ async def chat(req: ChatRequest):
             req.mode or "auto",
             req.temperature or 0.3,
         )
-        return ChatResponse(reply=reply, meta={"model": "gemini", "requested": "gemini-2.0-flash-001"})
+        resp = ChatResponse(reply=reply, meta={"model": "gemini", "requested": "gemini-2.0-flash-001"})
+        if cache:
+            _reply_cache.set(cache_key, resp)
+        return resp
     except HTTPException:
         raise
     except Exception as e:
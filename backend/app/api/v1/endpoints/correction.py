@@ -1,19 +1,34 @@
 from fastapi import APIRouter, Depends
 
-from backend.app.deps import verify_api_key
+from backend.app.deps import use_response_cache, verify_api_key
 from backend.app.schemas.correction import CorrectionResponse, CorrectionRequest
 from backend.app.services.correction_adapter import run_correction
 from backend.models.enums import DocumentType
+from backend.utils.cache import TTLCache, request_cache_key
 
 router = APIRouter()
 
+# identical requests -> response body (opt-in via X-Cache header)
+_response_cache = TTLCache(ttl_seconds=300)
+
 
 @router.post("", response_model=CorrectionResponse, dependencies=[Depends(verify_api_key)])
-async def correct(req: CorrectionRequest):
+async def correct(req: CorrectionRequest, cache: bool = Depends(use_response_cache)):
+    cache_key = None
+    if cache:
+        cache_key = request_cache_key({"model": req.model, "prompt": req.prompt, "type": req.document_type},
+                                      [req.text])
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     corrected = await run_correction(
         text=req.text,
         model_str=req.model,
         prompt=req.prompt,
         document_type=req.document_type or DocumentType.GENERAL,
     )
-    return {"corrected": corrected}
+    resp = {"corrected": corrected}
+    if cache:
+        _response_cache.set(cache_key, resp)
+    return resp
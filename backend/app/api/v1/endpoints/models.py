@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import time
-from typing import Dict, List, Optional, Any
+import asyncio
+from typing import Callable, Dict, List, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 
 from backend.config import logger
 from backend.core.config import settings
+from backend.utils.cache import TTLCache
 
 try:
     import google.generativeai as genai
@@ -16,67 +19,54 @@ except Exception:
 
 router = APIRouter()
 
-
-class _TTLCache:
-    def __init__(self, ttl_seconds: int = 180) -> None:
-        self.ttl = ttl_seconds
-        self._data: Dict[str, tuple[float, Any]] = {}
-
-    def get(self, key: str) -> Optional[Any]:
-        hit = self._data.get(key)
-        if not hit:
-            return None
-        ts, val = hit
-        if time.time() - ts > self.ttl:
-            self._data.pop(key, None)
-            return None
-        return val
-
-    def set(self, key: str, val: Any) -> None:
-        self._data[key] = (time.time(), val)
-
-
-_cache = _TTLCache(ttl_seconds=180)
+_cache = TTLCache(ttl_seconds=180)
+
+# keep-alive session for Ollama discovery so cache misses skip the TCP handshake
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_OLLAMA_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+# ---- static model lists (built once at import) ----
+# Static Gemini server-side OCR-friendly models (per your spec)
+_GEMINI_FIXED = (
+    "gemini-2.5-flash-image-preview",
+    "gemini-2.0-flash-001",
+    "gemini-2.0-flash-lite-001",
+    "gemini-1.5-pro",
+    "gemini-pro-vision",
+    "gemini-1.5-flash",
+)
+_MISTRAL_OCR = ("mistral-ocr-latest", "mistral-ocr-2503", "mistral-ocr-2505")
+_VLLM_MODELS = tuple(settings.VLLM_MODELS) or (
+    "google/gemma-3-4b-it",
+    "google/gemma-3-8b-it",
+    "google/gemma-3-12b-it",
+    "google/gemma-3-27b-it",
+)
 
 
 # ---- provider-specific resolvers ----
-def _models_gemini_fixed() -> List[str]:
-    # Static Gemini server-side OCR-friendly models (per your spec)
-    return [
-        "gemini-2.5-flash-image-preview",
-        "gemini-2.0-flash-001",
-        "gemini-2.0-flash-lite-001",
-        "gemini-1.5-pro",
-        "gemini-pro-vision",
-        "gemini-1.5-flash"
-    ]
+def _models_gemini_fixed() -> Sequence[str]:
+    return _GEMINI_FIXED
 
 
-def _models_mistral_ocr() -> List[str]:
-    return ["mistral-ocr-latest", "mistral-ocr-2503", "mistral-ocr-2505"]
+def _models_mistral_ocr() -> Sequence[str]:
+    return _MISTRAL_OCR
 
 
-def _models_vllm() -> List[str]:
-    if settings.VLLM_MODELS:
-        return list(settings.VLLM_MODELS)
-    return [
-        "google/gemma-3-4b-it",
-        "google/gemma-3-8b-it",
-        "google/gemma-3-12b-it",
-        "google/gemma-3-27b-it",
-    ]
+def _models_vllm() -> Sequence[str]:
+    return _VLLM_MODELS
 
 
-def _models_gemini_open_source() -> List[str]:
-    cache_key = "gemini_open_source"
-    cached = _cache.get(cache_key)
-    if cached:
-        return cached
+def _models_none() -> Sequence[str]:
+    return ()
+
 
+def _fetch_gemini_open_source() -> List[str]:
     fallback = ["models/gemma-3-4b-it", "models/gemma-3-12b-it"]
     if not genai or not settings.GEMINI_API_KEY:
         logger.warning("GEMINI_OPENSOURCE listing unavailable, returning fallback.")
-        _cache.set(cache_key, fallback)
         return fallback
 
     try:
@@ -87,58 +77,56 @@ def _models_gemini_open_source() -> List[str]:
             if hasattr(m, "supported_generation_methods")
                and "generateContent" in (m.supported_generation_methods or [])
         ]
-        if not names:
-            names = fallback
-        _cache.set(cache_key, names)
-        return names
+        return names or fallback
     except Exception as e:  # pragma: no cover
         logger.error("Failed to list Gemini models, using fallback: %s", e)
-        _cache.set(cache_key, fallback)
         return fallback
 
 
-def _models_ollama() -> List[str]:
-    cache_key = "ollama"
-    cached = _cache.get(cache_key)
-    if cached:
-        return cached
+def _models_gemini_open_source() -> List[str]:
+    return _cache.get_or_set("gemini_open_source", _fetch_gemini_open_source)
 
+
+def _fetch_ollama() -> List[str]:
     endpoint = (settings.OLLAMA_ENDPOINT or "http://localhost:11434").rstrip("/")
     try:
-        r = requests.get(f"{endpoint}/api/tags", timeout=10)
+        r = _OLLAMA_SESSION.get(f"{endpoint}/api/tags", timeout=10)
         if r.status_code == 200:
             data = r.json() or {}
             names = [m.get("name") for m in data.get("models", []) if m.get("name")]
             if names:
-                _cache.set(cache_key, names)
                 return names
         logger.warning("OLLAMA /api/tags returned %s; using fallback.", r.status_code)
     except Exception as e:  # pragma: no cover
         logger.warning("OLLAMA listing failed (%s); using fallback.", e)
 
-    fallback = ["gemma2:4b", "llava:7b", "gemma2:8b"]
-    _cache.set(cache_key, fallback)
-    return fallback
+    return ["gemma2:4b", "llava:7b", "gemma2:8b"]
+
+
+def _models_ollama() -> List[str]:
+    return _cache.get_or_set("ollama", _fetch_ollama)
 
 
-def get_ocr_models_for(provider: str) -> List[str]:
+_OCR_RESOLVERS: Dict[str, Callable[[], Sequence[str]]] = {
+    "GEMINI": _models_gemini_fixed,
+    "MISTRAL": _models_mistral_ocr,
+    "GEMINI_OPENSOURCE": _models_gemini_open_source,
+    "OLLAMA": _models_ollama,
+    "VLLM": _models_vllm,
+    "NONE": _models_none,
+}
+
+
+def get_ocr_models_for(provider: str) -> Sequence[str]:
     p = (provider or "").upper().strip()
-    if p == "GEMINI":
-        return _models_gemini_fixed()
-    if p == "MISTRAL":
-        return _models_mistral_ocr()
-    if p == "GEMINI_OPENSOURCE":
-        return _models_gemini_open_source()
-    if p == "OLLAMA":
-        return _models_ollama()
-    if p == "VLLM":
-        return _models_vllm()
-    if p == "NONE":
-        return []
-    raise HTTPException(status_code=400, detail=f"Unknown OCR provider: {provider}")
-
-
-def get_correction_models_for(provider: str) -> List[str]:
+    try:
+        resolver = _OCR_RESOLVERS[p]
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown OCR provider: {provider}")
+    return resolver()
+
+
+def get_correction_models_for(provider: str) -> Sequence[str]:
     """
     Simple approach: reuse the same discovery per provider for correction.
     Adjust here if your correction model sets differ from OCR.
@@ -146,18 +134,31 @@ def get_correction_models_for(provider: str) -> List[str]:
     return get_ocr_models_for(provider)
 
 
-def all_ocr_models_by_provider() -> Dict[str, List[str]]:
-    providers = ["GEMINI", "MISTRAL", "GEMINI_OPENSOURCE", "OLLAMA", "VLLM", "NONE"]
-    return {p: get_ocr_models_for(p) for p in providers}
+def all_ocr_models_by_provider() -> Dict[str, Sequence[str]]:
+    return _cache.get_or_set("all_ocr", lambda: {p: get_ocr_models_for(p) for p in _OCR_RESOLVERS})
+
 
+def all_correction_models_by_provider() -> Dict[str, Sequence[str]]:
+    return _cache.get_or_set("all_correction", lambda: {p: get_correction_models_for(p) for p in _OCR_RESOLVERS})
 
-def all_correction_models_by_provider() -> Dict[str, List[str]]:
-    providers = ["GEMINI", "MISTRAL", "GEMINI_OPENSOURCE", "OLLAMA", "VLLM", "NONE"]
-    return {p: get_correction_models_for(p) for p in providers}
+
+async def warm_model_cache() -> None:
+    """
+    Fetch the discovered model lists and (re)fill the cache, so user requests never
+    pay for a cold miss. Called at startup and periodically from the app lifespan.
+    """
+    ollama, gemini_os = await asyncio.gather(
+        run_in_threadpool(_fetch_ollama),
+        run_in_threadpool(_fetch_gemini_open_source),
+    )
+    _cache.set("ollama", ollama)
+    _cache.set("gemini_open_source", gemini_os)
+    _cache.set("all_ocr", {p: get_ocr_models_for(p) for p in _OCR_RESOLVERS})
+    _cache.set("all_correction", {p: get_correction_models_for(p) for p in _OCR_RESOLVERS})
 
 
 @router.get("", summary="List models by provider")
-def list_models(
+async def list_models(
         ocr_provider: Optional[str] = Query(
             None,
             description="e.g., GEMINI | MISTRAL | GEMINI_OPENSOURCE | OLLAMA | VLLM | NONE"
@@ -181,11 +182,12 @@ def list_models(
     if cached is not None:
         return cached
 
-    # compute on miss
-    resp: Dict[str, object] = {
-        "ocr": get_ocr_models_for(norm_ocr),
-        "correction": get_correction_models_for(norm_corr),
-    }
+    # compute on miss; resolvers may block on network discovery, so run them off the event loop
+    ocr, corr = await asyncio.gather(
+        run_in_threadpool(get_ocr_models_for, norm_ocr),
+        run_in_threadpool(get_correction_models_for, norm_corr),
+    )
+    resp: Dict[str, object] = {"ocr": ocr, "correction": corr}
 
     _cache.set(cache_key, resp)
     return resp
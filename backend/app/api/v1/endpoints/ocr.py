@@ -1,14 +1,29 @@
 from fastapi import APIRouter, Depends
 
-from backend.app.deps import verify_api_key
+from backend.app.deps import use_response_cache, verify_api_key
 from backend.app.schemas.ocr import OCRResponse, OCRRequest
 from backend.app.services.ocr_adapter import run_ocr
+from backend.utils.cache import TTLCache, request_cache_key
 
 router = APIRouter()
 
+# identical requests -> response body (opt-in via X-Cache header)
+_response_cache = TTLCache(ttl_seconds=300)
+
 
 @router.post("", response_model=OCRResponse, dependencies=[Depends(verify_api_key)])
-async def ocr(req: OCRRequest):
+async def ocr(req: OCRRequest, cache: bool = Depends(use_response_cache)):
+    cache_key = None
+    if cache:
+        cache_key = request_cache_key(
+            {"name": req.fileName, "lang": req.language, "type": req.documentType, "provider": req.provider,
+             "prompt": req.prompt},
+            [req.fileBase64],
+        )
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     text = await run_ocr(
         file_base64=req.fileBase64,
         file_name=req.fileName,
@@ -17,4 +32,7 @@ async def ocr(req: OCRRequest):
         provider_str=req.provider,
         prompt=req.prompt,
     )
-    return {"text": text, "pages": None, "images": None}
+    resp = {"text": text, "pages": None, "images": None}
+    if cache:
+        _response_cache.set(cache_key, resp)
+    return resp
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import io
 import json
-from typing import Any, Dict, List, Optional, Mapping, Sequence
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException
@@ -15,62 +19,166 @@ from backend.models.schemas import ImageProcessingRequest
 from backend.service.ocr_service import OCRService
 from backend.service.preprocess_image import dynamic_preprocess_image
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 router = APIRouter()
 
+# shared client for URL downloads: keep-alive pool instead of a fresh connect + TLS handshake per request
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_keepalive_connections=20))
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+# data URI header: "data:<mime>[;params],"; bounded so a comma-less payload isn't scanned end to end
+_DATA_URI_RE = re.compile(r"data:([^;,]{0,128})(?:;[^,]{0,128})?,")
+
+# PIL format -> MIME, used when PIL's own Image.MIME table has no entry
+_PIL_MIME = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+    "TIFF": "image/tiff",
+    "BMP": "image/bmp",
+    "PDF": "application/pdf",
+    "HEIC": "image/heic",  # if pillow-heif installed
+    "HEIF": "image/heif",
+}
+
 
 def _prune_none_deep(obj: Any) -> Any:
     """
-    Recursively remove None values from dicts/lists.
+    Remove None values from nested dicts/lists (iteratively, no recursion).
     Keeps falsy-but-valid values (0, False, "", [], {}) as-is.
     """
-    if isinstance(obj, Mapping):
-        out = {}
-        for k, v in obj.items():
-            pv = _prune_none_deep(v)
-            if pv is not None:  # only drop actual None
-                out[k] = pv
-        return out
-    if isinstance(obj, list):
-        return [_prune_none_deep(v) for v in obj if v is not None]
-    return obj
+    if type(obj) is dict or isinstance(obj, Mapping):
+        root: Any = {}
+    elif isinstance(obj, list):
+        root = []
+    else:
+        return obj
+
+    # (source, destination) pairs; children are created empty in place so order is preserved
+    stack = [(obj, root)]
+    while stack:
+        src, dst = stack.pop()
+        is_dict = type(dst) is dict
+        for k, v in (src.items() if is_dict else enumerate(src)):
+            if v is None:  # only drop actual None
+                continue
+            if type(v) is dict or isinstance(v, Mapping):
+                child: Any = {}
+                stack.append((v, child))
+            elif type(v) is list:
+                child = []
+                stack.append((v, child))
+            else:
+                child = v
+            if is_dict:
+                dst[k] = child
+            else:
+                dst.append(child)
+    return root
 
 
 # ----------------- MIME helpers -----------------
 
-def _sniff_mime(file_bytes: bytes) -> Optional[str]:
+# first byte -> candidate (signature, mime) pairs; one dict hit plus at most two prefix compares
+_MAGIC_TABLE: Dict[int, tuple] = {}
+for _sig, _mime in (
+        (b"%PDF", "application/pdf"),
+        (b"\xff\xd8\xff", "image/jpeg"),
+        (b"\x89PNG\r\n\x1a\n", "image/png"),
+        (b"GIF87a", "image/gif"),
+        (b"GIF89a", "image/gif"),
+        (b"II*\x00", "image/tiff"),
+        (b"MM\x00*", "image/tiff"),
+        (b"BM", "image/bmp"),
+):
+    _MAGIC_TABLE[_sig[0]] = _MAGIC_TABLE.get(_sig[0], ()) + ((_sig, _mime),)
+
+
+def _sniff_mime(file_bytes: bytes | bytearray) -> Optional[str]:
+    # Works on bytes/bytearray in place: startswith/find with offsets never slice the buffer
     if not file_bytes or len(file_bytes) < 8:
         return None
-    head = file_bytes[:16]
-    if head.startswith(b"%PDF"): return "application/pdf"
-    if head.startswith(b"\xff\xd8\xff"): return "image/jpeg"
-    if head.startswith(b"\x89PNG\r\n\x1a\n"): return "image/png"
-    if head.startswith(b"GIF87a") or head.startswith(b"GIF89a"): return "image/gif"
-    if head.startswith(b"RIFF") and b"WEBP" in head[8:16]: return "image/webp"
-    if head.startswith(b"II*\x00") or head.startswith(b"MM\x00*"): return "image/tiff"
-    if head.startswith(b"BM"): return "image/bmp"
+    for sig, mime in _MAGIC_TABLE.get(file_bytes[0], ()):
+        if file_bytes.startswith(sig):
+            return mime
+    # RIFF container: WEBP marker sits at offset 8
+    if file_bytes.startswith(b"RIFF") and file_bytes.find(b"WEBP", 8, 16) != -1:
+        return "image/webp"
     return None
 
 
+# what the sniffer / PIL fallback can produce (plus the common "image/jpg" alias from headers & data URIs)
+_SUPPORTED_MIMES = frozenset({
+    "application/pdf",
+    "image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp",
+    "image/tiff", "image/bmp", "image/heic", "image/heif",
+})
+
+
 def _is_supported(mime: Optional[str]) -> bool:
-    return bool(mime) and (mime == "application/pdf" or mime.startswith("image/"))
+    return mime in _SUPPORTED_MIMES
 
 
 # ----------------- generic helpers -----------------
 
-def _enum_val(e) -> Optional[str]:
+def _enum_val_uncached(e) -> Optional[str]:
     try:
         return e.value if hasattr(e, "value") else (e.name if hasattr(e, "name") else str(e))
     except Exception:
         return None
 
 
+_enum_val_cached = lru_cache(maxsize=128)(_enum_val_uncached)
+
+
+def _enum_val(e) -> Optional[str]:
+    try:
+        return _enum_val_cached(e)
+    except TypeError:  # unhashable provider value
+        return _enum_val_uncached(e)
+
+
 def _safe_decode_bytes(b: bytes) -> str:
-    for enc in ("utf-8", "utf-16", "latin-1"):
+    # UTF-16 only when a BOM says so; latin-1 can decode anything, so it is the final fallback
+    if b[:2] in (b"\xff\xfe", b"\xfe\xff"):
         try:
-            return b.decode(enc)
-        except Exception:
-            continue
-    return ""
+            return b.decode("utf-16")
+        except UnicodeDecodeError:
+            pass
+    try:
+        return b.decode("utf-8")
+    except UnicodeDecodeError:
+        return b.decode("latin-1")
+
+
+# characters that may follow the opening bracket of valid JSON (after whitespace)
+_JSON_OBJECT_NEXT = frozenset('"}')
+_JSON_ARRAY_NEXT = frozenset('"{[]-0123456789tfn')
 
 
 def _maybe_json_loads(s: str) -> Any:
@@ -78,70 +186,87 @@ def _maybe_json_loads(s: str) -> Any:
     if not s2:
         return None
     if s2[0] in "{[" and s2[-1] in "]}":
+        # Cheap sentinel before a full parse: OCR text that merely starts with a bracket
+        # (e.g. "[Page 1] ...") is rejected without running the JSON decoder over it.
+        nxt = s2[1:257].lstrip()[:1]
+        if nxt not in (_JSON_OBJECT_NEXT if s2[0] == "{" else _JSON_ARRAY_NEXT):
+            return None
         try:
-            return json.loads(s2)
+            return _json_loads(s2)
         except Exception:
             return None
     return None
 
 
+# value types that can never need flattening
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
 def _flatten_dict(d: Mapping[str, Any], parent: str = "", sep: str = ".") -> Dict[str, Any]:
+    # Fast path: already-flat dicts (typical plain-text provider output) skip the traversal
+    if not parent and all(type(v) in _SCALAR_TYPES for v in d.values()):
+        return {str(k): v for k, v in d.items()}
+
     out: Dict[str, Any] = {}
-    for k, v in d.items():
-        key = f"{parent}{sep}{k}" if parent else str(k)
-        if isinstance(v, Mapping):
-            out.update(_flatten_dict(v, key, sep))
-        elif isinstance(v, list):
+    # explicit stack of (key, value, is_list_item), pushed in reverse so keys come out in order
+    stack: List[tuple] = [
+        (f"{parent}{sep}{k}" if parent else str(k), v, False) for k, v in reversed(list(d.items()))
+    ]
+    while stack:
+        key, v, in_list = stack.pop()
+        if type(v) is dict or isinstance(v, Mapping):
+            stack.extend((f"{key}{sep}{k}" if key else str(k), vv, False) for k, vv in reversed(list(v.items())))
+        elif type(v) is list and not in_list:
             # index lists for determinism
-            for i, item in enumerate(v):
-                if isinstance(item, Mapping):
-                    out.update(_flatten_dict(item, f"{key}[{i}]", sep))
-                else:
-                    out[f"{key}[{i}]"] = item
+            stack.extend((f"{key}[{i}]", v[i], True) for i in range(len(v) - 1, -1, -1))
         else:
             out[key] = v
     return out
 
 
+# Human-important keys rendered first by _dict_to_kv_text, then the rest alphabetically
+_PREFERRED_KEYS = (
+    "full_name", "full_name_np", "full_name_en",
+    "citizenship_no", "citizenship_number",
+    "date_of_birth", "dob_text_np", "dob_structured",
+    "place_of_birth", "birthplace_np",
+    "gender",
+    "father_name", "mother_name", "grandfather_name",
+    "permanent_address", "current_address", "father_address", "mother_address",
+    "citizenship_type", "certificate_type_np", "issuing_office_np",
+)
+_PREFERRED_SET = frozenset(_PREFERRED_KEYS)
+
+
 def _dict_to_kv_text(d: Dict[str, Any]) -> str:
     if not d:
         return ""
-    # Prefer human-important keys first, then alphabetic
-    preferred = [
-        "full_name", "full_name_np", "full_name_en",
-        "citizenship_no", "citizenship_number",
-        "date_of_birth", "dob_text_np", "dob_structured",
-        "place_of_birth", "birthplace_np",
-        "gender",
-        "father_name", "mother_name", "grandfather_name",
-        "permanent_address", "current_address", "father_address", "mother_address",
-        "citizenship_type", "certificate_type_np", "issuing_office_np",
-    ]
     flat = _flatten_dict(d)
-    lines: List[str] = []
-    used = set()
-    for k in preferred:
-        if k in flat:
-            lines.append(f"{k}: {flat[k]}")
-            used.add(k)
-    for k in sorted(k for k in flat.keys() if k not in used):
-        lines.append(f"{k}: {flat[k]}")
-    return "\n".join(lines)
+    keys = [k for k in _PREFERRED_KEYS if k in flat]
+    keys.extend(sorted(flat.keys() - _PREFERRED_SET))
+    return "\n".join([f"{k}: {flat[k]}" for k in keys])
 
 
 def _summarize_list(lst: Sequence[Any]) -> str:
     if not lst:
         return ""
     # If list of dicts, show a compact table-like block
-    if all(isinstance(x, Mapping) for x in lst):
-        # gather keys (cap at some size to keep it readable)
-        keys = list({k for item in lst for k in item.keys()})
-        keys.sort()
-        lines = []
-        lines.append("items:")
-        for i, item in enumerate(lst[:50]):  # avoid gigantic outputs
-            row = ", ".join(f"{k}={item.get(k)!r}" for k in keys if k in item)
-            lines.append(f"  - {row}")
+    if all(type(x) is dict for x in lst):
+        shown = lst[:50]  # avoid gigantic outputs
+        lines = ["items:"]
+        first_keys = shown[0].keys()
+        if all(item.keys() == first_keys for item in shown[1:]):
+            # homogeneous rows: one sorted key tuple, no per-key membership probes
+            keys = tuple(sorted(first_keys))
+            for item in shown:
+                row = ", ".join(f"{k}={item[k]!r}" for k in keys)
+                lines.append(f"  - {row}")
+        else:
+            # only keys of the rows actually shown can appear in the output
+            keys = tuple(sorted({k for item in shown for k in item.keys()}))
+            for item in shown:
+                row = ", ".join(f"{k}={item[k]!r}" for k in keys if k in item)
+                lines.append(f"  - {row}")
         if len(lst) > 50:
             lines.append(f"  ... ({len(lst) - 50} more)")
         return "\n".join(lines)
@@ -152,39 +277,55 @@ def _summarize_list(lst: Sequence[Any]) -> str:
     return "\n".join(f"- {it}" for it in items)
 
 
-def _extract_common_fields(d: Mapping[str, Any]) -> Dict[str, Any]:
+class _Common(NamedTuple):
+    raw_text: Any
+    corrected_text: Any
+    text: Any
+    pages: Any
+    images: Any
+    language_detected: Any
+    confidence: Any
+    document_type: Any
+    structured_data: Any
+
+
+def _extract_common_fields(d: Dict[str, Any]) -> _Common:
     """
     Pulls out common keys if present; leaves unknowns in structured_data.
     """
-    out = {
-        "raw_text": d.get("raw_text"),
-        "corrected_text": d.get("corrected_text"),
-        "text": d.get("text"),
-        "pages": d.get("pages"),
-        "images": d.get("images"),
-        "language_detected": d.get("language_detected"),
-        "confidence": d.get("confidence"),
-        "document_type": d.get("document_type"),
-        "structured_data": d.get("structured_data"),
-    }
+    structured_data = d.get("structured_data")
     # structured_json may be dict or JSON string
     sj = d.get("structured_json")
-    if isinstance(sj, Mapping):
+    t = type(sj)
+    if t is str:
+        sj = _maybe_json_loads(sj)
+        t = type(sj)
+    if t is dict:
         sd = sj.get("structured_data")
-        if isinstance(sd, Mapping):
-            out["structured_data"] = sd
-    elif isinstance(sj, str):
-        parsed = _maybe_json_loads(sj)
-        if isinstance(parsed, Mapping):
-            sd = parsed.get("structured_data")
-            if isinstance(sd, Mapping):
-                out["structured_data"] = sd
-    return out
-
-
-def _looks_like_pure_structured(d: Mapping[str, Any]) -> bool:
-    textish = {"raw_text", "corrected_text", "text", "pages", "images", "language_detected", "confidence"}
-    return not any(k in d for k in textish)
+        if type(sd) is dict:
+            structured_data = sd
+    return _Common(
+        d.get("raw_text"),
+        d.get("corrected_text"),
+        d.get("text"),
+        d.get("pages"),
+        d.get("images"),
+        d.get("language_detected"),
+        d.get("confidence"),
+        d.get("document_type"),
+        structured_data,
+    )
+
+
+def _page_text(p: Any) -> Optional[str]:
+    """First non-blank text of a page (dict: text > raw_text > content, or a plain string)."""
+    if type(p) is dict:
+        for k in ("text", "raw_text", "content"):
+            val = p.get(k)
+            if isinstance(val, str) and val.strip():
+                return val
+        return None
+    return p if isinstance(p, str) and p.strip() else None
 
 
 def _normalize_any_result(result: Any) -> Dict[str, Any]:
@@ -228,7 +369,7 @@ def _normalize_any_result(result: Any) -> Dict[str, Any]:
     if isinstance(result, list):
         text = _summarize_list(result)
         # If list of dicts, keep as structured_data
-        if all(isinstance(x, Mapping) for x in result):
+        if all(type(x) is dict for x in result):
             structured_data = {"items": result}
         return {
             "text": text,
@@ -249,19 +390,26 @@ def _normalize_any_result(result: Any) -> Dict[str, Any]:
                 result = result.model_dump()
             except Exception:
                 result = dict(result)
+        # downstream helpers only deal with plain dicts (cheap `type(x) is dict` checks)
+        if type(result) is not dict:
+            result = dict(result)
 
         common = _extract_common_fields(result)
-        raw_text = common["raw_text"]
-        corrected_text = common["corrected_text"]
-        pages = common["pages"]
-        images = common["images"]
-        language_detected = common["language_detected"]
-        confidence = common["confidence"]
-        document_type = common["document_type"]
-        structured_data = common["structured_data"]
-
-        # If the entire dict is “pure structured”, treat it as structured_data
-        if structured_data is None and _looks_like_pure_structured(result):
+        raw_text = common.raw_text
+        corrected_text = common.corrected_text
+        pages = common.pages
+        images = common.images
+        language_detected = common.language_detected
+        confidence = common.confidence
+        document_type = common.document_type
+        structured_data = common.structured_data
+
+        # If the entire dict is “pure structured” (none of the text-ish fields were found above),
+        # treat it as structured_data
+        if structured_data is None and (
+                raw_text is None and corrected_text is None and common.text is None and pages is None
+                and images is None and language_detected is None and confidence is None
+        ):
             structured_data = dict(result)
 
         # Decide text (priority: corrected > raw > text > pages join > structured serialization > fallback)
@@ -269,26 +417,15 @@ def _normalize_any_result(result: Any) -> Dict[str, Any]:
             text = corrected_text
         elif isinstance(raw_text, str) and raw_text.strip():
             text = raw_text
-        elif isinstance(common["text"], str) and common["text"].strip():
-            text = common["text"]
+        elif isinstance(common.text, str) and common.text.strip():
+            text = common.text
         else:
             # pages
             if isinstance(pages, list) and pages:
-                page_texts: List[str] = []
-                for p in pages:
-                    if isinstance(p, Mapping):
-                        for k in ("text", "raw_text", "content"):
-                            val = p.get(k)
-                            if isinstance(val, str) and val.strip():
-                                page_texts.append(val)
-                                break
-                    elif isinstance(p, str) and p.strip():
-                        page_texts.append(p)
-                if page_texts:
-                    text = "\n\n".join(page_texts)
+                text = "\n\n".join(filter(None, map(_page_text, pages)))
 
             # structured fallback
-            if not text and isinstance(structured_data, Mapping):
+            if not text and type(structured_data) is dict:
                 text = _dict_to_kv_text(structured_data)
 
         # final fallback
@@ -300,7 +437,7 @@ def _normalize_any_result(result: Any) -> Dict[str, Any]:
             "corrected_text": corrected_text if isinstance(corrected_text, str) else None,
             "pages": pages if isinstance(pages, list) else None,
             "images": images if isinstance(images, list) else None,
-            "structured_data": structured_data if isinstance(structured_data, Mapping) else None,
+            "structured_data": structured_data if type(structured_data) is dict else None,
             "meta_partial": {"language_detected": language_detected, "confidence": confidence,
                              "document_type": document_type},
         }
@@ -339,39 +476,46 @@ async def ocr_premium(request: ImageProcessingRequest):
                                 detail="Provide either an image/PDF URL or base64 string, but not both.")
 
         if request.image_url:
-            async with httpx.AsyncClient(timeout=60) as client:
-                r = await client.get(str(request.image_url))
-            if r.status_code != 200:
-                raise HTTPException(status_code=400, detail="Failed to fetch file from URL.")
-            file_bytes = r.content
-            header_ct = (r.headers.get("content-type") or "").split(";")[0].strip().lower() or None
-            file_type = _sniff_mime(file_bytes) or header_ct
+            url = str(request.image_url)
+            async with _get_http_client().stream("GET", url) as r:
+                if r.status_code != 200:
+                    raise HTTPException(status_code=400, detail="Failed to fetch file from URL.")
+                header_ct = (r.headers.get("content-type") or "").split(";")[0].strip().lower() or None
+                buf = bytearray()
+                file_type = None
+                async for chunk in r.aiter_bytes(chunk_size=65536):
+                    buf += chunk
+                    # Sniff as soon as the magic bytes are in; abort unsupported files early
+                    if file_type is None and len(buf) >= 16:
+                        file_type = _sniff_mime(buf) or header_ct
+                        if not _is_supported(file_type):
+                            break
+            file_bytes = bytes(buf)
+            if file_type is None:
+                file_type = _sniff_mime(file_bytes) or header_ct
         else:
             b64 = request.base64_image
             data_uri_mime = None
 
             # Accept data URLs like: data:image/png;base64,AAAA...
             if isinstance(b64, str) and b64.startswith("data:"):
-                # Extract MIME & payload safely
-                try:
-                    header, _, payload = b64.partition(",")
-                    # header example: "data:image/png;base64"
-                    mime_part = header[5:]  # drop 'data:'
-                    # take up to the first ';' as the MIME (e.g., "image/png")
-                    data_uri_mime = mime_part.split(";")[0].strip().lower() or None
-                    b64 = payload
-                except Exception:
+                # One bounded match extracts MIME & payload offset, e.g. "data:image/png;base64,"
+                m = _DATA_URI_RE.match(b64)
+                if not m:
                     raise HTTPException(status_code=400, detail="Invalid data URI format for base64 content.")
+                data_uri_mime = m.group(1).strip().lower() or None
+                b64 = b64[m.end():]
 
             # Normalize whitespace and padding
             b64 = (b64 or "").strip()
             # Some clients send base64 in form-encoded bodies where '+' becomes space.
             # If you EVER accept form-encoded, you'd need: b64 = b64.replace(" ", "+")
-            # For JSON bodies, we keep it strict; still, remove common whitespace:
-            b64 = "".join(b64.split())
+            # For JSON bodies, interior whitespace is left in place: b64decode(validate=False)
+            # skips it, which saves a full copy of a potentially multi-MB payload.
 
-            # Fix padding (base64 length must be multiple of 4)
-            missing = (-len(b64)) % 4
+            # Fix padding (base64 length must be multiple of 4), counting only non-whitespace chars
+            payload_len = len(b64) - sum(b64.count(ws) for ws in " \n\r\t")
+            missing = (-payload_len) % 4
             if missing:
                 b64 += "=" * missing
 
@@ -391,25 +535,11 @@ async def ocr_premium(request: ImageProcessingRequest):
             file_type = data_uri_mime or _sniff_mime(file_bytes)
 
             # As a last resort, try to open via PIL to validate & infer type
-            if not file_type:
+            if not file_type and Image is not None:
                 try:
-                    from PIL import Image
-                    import io
                     with Image.open(io.BytesIO(file_bytes)) as im:
                         fmt = (im.format or "").upper()
-                        # Map PIL format -> MIME
-                        pil2mime = {
-                            "JPEG": "image/jpeg",
-                            "PNG": "image/png",
-                            "GIF": "image/gif",
-                            "WEBP": "image/webp",
-                            "TIFF": "image/tiff",
-                            "BMP": "image/bmp",
-                            "PDF": "application/pdf",
-                            "HEIC": "image/heic",  # if pillow-heif installed
-                            "HEIF": "image/heif",
-                        }
-                        file_type = pil2mime.get(fmt)
+                        file_type = Image.MIME.get(fmt) or _PIL_MIME.get(fmt)
                 except Exception:
                     pass
 
@@ -422,7 +552,8 @@ async def ocr_premium(request: ImageProcessingRequest):
         if request.ocr_provider != OCRProvider.MISTRAL:
             if file_type != "application/pdf" and file_type and file_type.startswith("image/"):
                 try:
-                    processed_bytes, preprocessing_report = dynamic_preprocess_image(
+                    processed_bytes, preprocessing_report = await asyncio.to_thread(
+                        dynamic_preprocess_image,
                         file_bytes,
                         preprocessing_options={"denoise": {"strength": 7, "template": 7, "search": 21}}
                     )
@@ -6,3 +6,8 @@ from backend.core.config import settings
 async def verify_api_key(x_api_key: str | None = Header(default=None)):
     if settings.API_KEY and x_api_key != settings.API_KEY:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+
+
+async def use_response_cache(x_cache: str | None = Header(default=None)) -> bool:
+    """Response caching is opt-in: clients send `X-Cache: readWrite` to reuse identical results."""
+    return (x_cache or "").strip().lower() == "readwrite"
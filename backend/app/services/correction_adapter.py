@@ -1,5 +1,6 @@
 import logging
 import sys
+from functools import lru_cache
 from pathlib import Path as _P
 from typing import Tuple
 
@@ -13,6 +14,7 @@ if _engine.exists():
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
 def _split_provider(provider_str: str) -> Tuple[str, str | None]:
     parts = provider_str.split(":", 1)
     if len(parts) == 2:
@@ -56,10 +58,15 @@ async def run_correction(
         instruction_prompt=final_prompt,
     )
 
-    corrected = provider.correct_text(
+    kwargs = dict(
         raw_text=text,
         document_type=document_type,
         document_format=DocumentFormat.STANDARD,
         language=Language.AUTO_DETECT,
     )
+    # Providers with a native async path don't tie up the event loop while waiting on the model
+    correct_async = getattr(provider, "correct_text_async", None)
+    if correct_async is not None:
+        return await correct_async(**kwargs)
+    corrected = provider.correct_text(**kwargs)
     return corrected
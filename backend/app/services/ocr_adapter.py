@@ -1,7 +1,9 @@
+import asyncio
 import base64
 import logging
 import mimetypes
 import sys
+from functools import lru_cache
 from pathlib import Path as _P
 from typing import Tuple
 
@@ -21,6 +23,7 @@ def _detect_mime_from_name(name: str) -> str:
     return guess or "application/octet-stream"
 
 
+@lru_cache(maxsize=64)
 def _split_provider(provider_str: str) -> Tuple[str, str | None]:
     # "PROVIDER:MODEL" -> ("PROVIDER", "MODEL")
     parts = provider_str.split(":", 1)
@@ -55,7 +58,8 @@ async def run_ocr(
 
     if file_type != "application/pdf" and file_type and file_type.startswith("image/"):
         try:
-            processed_bytes, preprocessing_report = dynamic_preprocess_image(
+            processed_bytes, preprocessing_report = await asyncio.to_thread(
+                dynamic_preprocess_image,
                 file_bytes,
                 preprocessing_options={"denoise": {"strength": 7, "template": 7, "search": 21}}
             )
@@ -79,6 +83,7 @@ async def run_ocr(
         max_pdf_pages=5,
         pdf_dpi=300,
         custom_prompt=prompt,
+        include_page_images=False,  # only the text is used below
         **provider_kwargs,
     )
     # result contains keys raw_text, structured_json, pdf_content, status, ...
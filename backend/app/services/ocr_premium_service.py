@@ -8,10 +8,20 @@ from backend.app.schemas.ocr_premium import OCRPremiumRequest, OCRPremiumRespons
 from backend.document_content.enhance_document_processor import FastAPIDocumentProcessor
 
 
+_MAGIC = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+
+
 def _detect_mime_from_sniff(file_bytes: bytes, fallback: str) -> str:
-    # If this is clearly a PDF, override content-type
-    if file_bytes[:5] == b"%PDF-":
-        return "application/pdf"
+    # If the magic bytes identify the format, override content-type
+    for sig, mime in _MAGIC:
+        if file_bytes.startswith(sig):
+            return mime
     return fallback
 
 
@@ -31,34 +41,58 @@ def _to_markdown_from_struct(structured: Any) -> Optional[str]:
     if not structured:
         return None
 
-    def kv_md(d: Dict[str, Any]) -> str:
-        lines = []
-        for k, v in d.items():
-            if isinstance(v, dict):
-                lines.append(f"### {k}\n")
-                lines.append(kv_md(v))
-            elif isinstance(v, list):
-                lines.append(f"- **{k}**:")
-                for item in v:
-                    if isinstance(item, (dict, list)):
-                        lines.append(f"  - {item!r}")
-                    else:
-                        lines.append(f"  - {item}")
+    def kv_md(d: Dict[str, Any], lines: List[str]) -> None:
+        # appends into one shared list; the caller joins once at the end.
+        # Nested dicts are walked with an explicit stack of item iterators instead of recursion.
+        stack = [iter(d.items())]
+        while stack:
+            for k, v in stack[-1]:
+                t = type(v)
+                if t is dict:
+                    lines.append(f"### {k}\n")
+                    stack.append(iter(v.items()))
+                    break
+                elif t is list:
+                    lines.append(f"- **{k}**:")
+                    for item in v:
+                        if type(item) in (dict, list):
+                            lines.append(f"  - {item!r}")
+                        else:
+                            lines.append(f"  - {item}")
+                else:
+                    lines.append(f"- **{k}**: {v}")
             else:
-                lines.append(f"- **{k}**: {v}")
-        return "\n".join(lines)
+                stack.pop()
 
-    if isinstance(structured, dict):
-        return kv_md(structured)
-    if isinstance(structured, list):
+    # JSON-derived input only holds plain dicts/lists, so exact type checks suffice
+    t = type(structured)
+    if t is dict:
+        out: List[str] = []
+        kv_md(structured, out)
+        return "\n".join(out)
+    if t is list:
         # List of rows -> table if rows are dicts with same keys
-        if structured and all(isinstance(r, dict) for r in structured):
-            keys = list({k for row in structured for k in row.keys()})
-            header = "| " + " | ".join(keys) + " |\n| " + " | ".join(["---"] * len(keys)) + " |"
-            rows = []
-            for row in structured:
-                rows.append("| " + " | ".join(str(row.get(k, "")) for k in keys) + " |")
-            return "\n".join([header] + rows)
+        if structured and all(type(r) is dict for r in structured):
+            k0 = structured[0].keys()
+            homogeneous = all(row.keys() == k0 for row in structured)
+            if homogeneous:
+                # common case: every row has the same keys, so no union and no .get defaults
+                keys = list(k0)
+            else:
+                # union of keys in first-seen order, gathered in one pass
+                keys = list(dict.fromkeys(k for row in structured for k in row))
+            sep = " | "
+            out = [None] * (2 + len(structured))
+            out[0] = "| " + sep.join(keys) + " |"
+            out[1] = "| " + sep.join(["---"] * len(keys)) + " |"
+            if homogeneous:
+                row_fmt = "| " + sep.join(["{}"] * len(keys)) + " |"
+                for i, row in enumerate(structured, 2):
+                    out[i] = row_fmt.format(*[row[k] for k in keys])
+            else:
+                for i, row in enumerate(structured, 2):
+                    out[i] = "| " + sep.join([str(row.get(k, "")) for k in keys]) + " |"
+            return "\n".join(out)
         # Fallback bullet list
         return "\n".join(f"- {item!r}" for item in structured)
     # Fallback
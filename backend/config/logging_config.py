@@ -1,6 +1,9 @@
+import atexit
+import functools
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 from pathlib import Path
 
@@ -43,6 +46,31 @@ def file_log_handler(file_name):
     return fileHandler
 
 
+# One background listener per log file; request threads only enqueue records
+_listeners = {}
+
+
+def _stop_listeners():
+    for listener in _listeners.values():
+        listener.stop()
+
+
+atexit.register(_stop_listeners)
+
+
+def queued_file_log_handler(file_name):
+    log_queue = queue.Queue(-1)
+    file_handler = file_log_handler(file_name)
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[file_name] = listener
+
+    queueHandler = logging.handlers.QueueHandler(log_queue)
+    # Don't enqueue records the file handler would drop anyway
+    queueHandler.setLevel(file_handler.level)
+    return queueHandler
+
+
 class CustomExtraLogAdapter(logging.LoggerAdapter):
     def process(self, msg, kwargs):
         context = self.extra.get('extra') if self.extra else 'NO_CONTEXT'
@@ -50,6 +78,7 @@ class CustomExtraLogAdapter(logging.LoggerAdapter):
         return '[%s] %s' % (my_context, msg), kwargs
 
 
+@functools.lru_cache(maxsize=32)
 def get_logger(file_name="kyc_log.log"):
     """
         from app.logger import get_logger
@@ -73,8 +102,8 @@ def get_logger(file_name="kyc_log.log"):
         console_handler = console_log_handler()
         logger_instance.addHandler(console_handler)
 
-        # Determine the file name for the file handler
-        file_handler = file_log_handler(file_name)
+        # File writes go through a queue so disk I/O happens off the calling thread
+        file_handler = queued_file_log_handler(file_name)
         logger_instance.addHandler(file_handler)
         logger_instance = CustomExtraLogAdapter(logger_instance, {"extra": None})
 
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -42,9 +43,18 @@ class Settings(BaseSettings):
     VLLM_SERVER_URL: Optional[str] = None
     VLLM_MODELS: List[str] = []  # optional static list for VLLM
 
+    # Strictly validate inline chat attachments before forwarding them (costs a full decode)
+    VALIDATE_B64: bool = False
+
     # --- Back-compat alias (if you had OLLAMA_API in old code) ---
     # Define but don't use elsewhere; set OLLAMA_ENDPOINT in .env instead.
     OLLAMA_API: Optional[str] = None
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Single Settings instance; usable directly or as a FastAPI dependency (Depends(get_settings))."""
+    return Settings()
+
+
+settings = get_settings()
@@ -0,0 +1,45 @@
+from functools import lru_cache
+
+from backend.models.enums import Language
+
+# Instruction block shared by the Gemini open-source, Ollama and vLLM correctors. The static
+# instructions come first and stay byte-identical for every request, so servers with prefix
+# caching (vLLM --enable-prefix-caching) reuse their prefill; document/language bits follow.
+_STATIC_PREAMBLE = """You are an expert text correction AI. Your task is to correct OCR errors in text extracted from a document.
+
+        Instructions:
+        1. Correct spelling mistakes and OCR errors
+        2. Fix formatting issues while preserving original structure
+        3. Preserve mathematical expressions in LaTeX format
+        4. Replace phrases like "Dx heads towards 0" with proper limit notation
+        5. Maintain all original information - do not add or remove content
+        6. Output ONLY the corrected text in markdown, no explanations"""
+
+_HEADER_TMPL = _STATIC_PREAMBLE + """
+
+        Document: {doc_format} {doc_type}.
+        {language_instruction}"""
+
+_LANG_INSTR = {
+    Language.NEPALI: "The text contains Nepali language. Ensure proper Devanagari script accuracy.",
+    Language.ENGLISH: "The text is in English. Focus on English spelling and grammar.",
+}
+
+_SEG_NOTE = ("The text is split into segments, each starting with a line like ---SEG 0---. "
+             "Keep every marker line exactly as it is and correct each segment independently.")
+
+
+@lru_cache(maxsize=64)
+def correction_header(doc_format: str, doc_type: str, language: Language, segmented: bool = False) -> str:
+    language_instruction = _LANG_INSTR.get(language, "")
+    if segmented:
+        language_instruction = f"{language_instruction} {_SEG_NOTE}".strip()
+    return _HEADER_TMPL.format(
+        doc_format=doc_format, doc_type=doc_type, language_instruction=language_instruction
+    ).rstrip()
+
+
+def build_correction_prompt(raw_text: str, doc_format: str, doc_type: str, language: Language,
+                            segmented: bool = False) -> str:
+    return (correction_header(doc_format, doc_type, language, segmented)
+            + "\n\n        Original OCR Text:\n        " + raw_text + "\n\n        Corrected Text:")
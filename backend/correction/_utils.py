@@ -0,0 +1,33 @@
+import re
+from typing import List
+
+# Boilerplate lead-ins LLMs put before the corrected text
+_PREFIX_RE = re.compile(
+    r"^\s*(?:Corrected Text:|Here is the corrected text:|The corrected text is:|Corrected version:)\s*",
+    re.IGNORECASE,
+)
+
+
+def strip_response_prefixes(response: str) -> str:
+    """Drop any run of lead-in prefixes (e.g. "Here is the corrected text:\nCorrected Text:")."""
+    cleaned = response.strip()
+    while m := _PREFIX_RE.match(cleaned):
+        cleaned = cleaned[m.end():]
+    return cleaned
+
+
+def split_paragraph_chunks(text: str, target_chars: int = 1500) -> List[str]:
+    """Group blank-line separated paragraphs into chunks of roughly target_chars (a longer paragraph stays whole)."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for para in text.split("\n\n"):
+        if current and size + len(para) > target_chars:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(para)
+        size += len(para) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
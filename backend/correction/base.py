@@ -1,9 +1,9 @@
 import logging
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
 
 from backend.models.enums import DocumentType, DocumentFormat, Language
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -11,7 +11,14 @@ class BaseCorrectionProvider:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.client: Any = None
-        self.configure()
+        self._configured = False
+        self._ensure_configured()
+
+    def _ensure_configured(self):
+        """Run configure() once per instance; subclasses must not call it again from __init__."""
+        if not self._configured:
+            self.configure()
+            self._configured = True
 
     def configure(self):
         raise NotImplementedError
@@ -19,3 +26,16 @@ class BaseCorrectionProvider:
     def correct_text(self, raw_text: str, document_type: DocumentType,
                      document_format: DocumentFormat, language: Language) -> str:
         raise NotImplementedError
+
+    def correct_batch(self, texts: List[str], document_type: DocumentType,
+                      document_format: DocumentFormat, language: Language) -> List[str]:
+        """Correct several texts (pages/chunks); providers override this to overlap or pack round trips."""
+        return [self.correct_text(text, document_type, document_format, language) for text in texts]
+
+    def _correct_concurrently(self, texts: List[str], document_type: DocumentType,
+                              document_format: DocumentFormat, language: Language,
+                              max_workers: int = 4) -> List[str]:
+        if len(texts) <= 1:
+            return [self.correct_text(text, document_type, document_format, language) for text in texts]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as pool:
+            return list(pool.map(lambda t: self.correct_text(t, document_type, document_format, language), texts))
@@ -1,29 +1,14 @@
-import google.generativeai as genai
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from backend.config import logger
 from backend.correction.base import BaseCorrectionProvider
 from backend.models.enums import DocumentType, Language, DocumentFormat
 
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
-class GeminiCorrectionProvider(BaseCorrectionProvider):
-    def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
-        self.model_name = model  # Set model_name before calling parent __init__
-        super().__init__(api_key)  # Call parent __init__ which calls configure()
-        self.model = None
-        self.client = None
-
-    def configure(self):
-        try:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(model_name=self.model_name)
-        except Exception as e:
-            logger.error(f"Failed to configure Gemini client: {e}")
-            raise
-
-    def correct_text(self, raw_text: str, document_type: DocumentType,
-                     document_format: DocumentFormat, language: Language) -> str:
-        try:
-            system_instructions = '''Role: You are an AI that corrects text extracted by OCR, ensuring it matches the original document.
+_SYSTEM_INSTRUCTIONS = '''Role: You are an AI that corrects text extracted by OCR, ensuring it matches the original document.
             Input: Raw text output from OCR, which may contain errors such as misspellings, incorrect formatting, or missing characters.
             Task:
             - Correct all OCR errors to accurately reflect the original document.
@@ -34,16 +19,51 @@ class GeminiCorrectionProvider(BaseCorrectionProvider):
             - Do not add, remove, or alter document_content beyond necessary corrections.
             Output: Only the corrected text in markdown with LaTeX for math, no explanations or additional comments.'''
 
-            correction_prompt = f"""{system_instructions}
+# Static correction prompt; only the document/language bits and the OCR text are filled in per call
+_CORRECTION_TMPL = """{system_instructions}
 
-            Correct the following OCR text from a {document_format.value} {document_type.value} document.
-            Expected language: {language.value}
+            Correct the following OCR text from a {doc_format} {doc_type} document.
+            Expected language: {language}
 
             Raw OCR text:
             {raw_text}
 
             Output the corrected text in markdown, preserving mathematical expressions in LaTeX."""
 
+
+@lru_cache(maxsize=16)
+def _get_gemini_model(api_key: str, model_name: str) -> "genai.GenerativeModel":
+    """Configure the SDK and build the model once per (api_key, model_name)."""
+    # SDK is imported on first use so processes that never pick Gemini don't load it
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name=model_name)
+
+
+class GeminiCorrectionProvider(BaseCorrectionProvider):
+    def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
+        self.model_name = model  # Set model_name before calling parent __init__
+        super().__init__(api_key)  # Call parent __init__ which calls configure()
+
+    def configure(self):
+        try:
+            self.model = _get_gemini_model(self.api_key, self.model_name)
+        except Exception as e:
+            logger.error(f"Failed to configure Gemini client: {e}")
+            raise
+
+    def correct_text(self, raw_text: str, document_type: DocumentType,
+                     document_format: DocumentFormat, language: Language) -> str:
+        try:
+            correction_prompt = _CORRECTION_TMPL.format(
+                system_instructions=_SYSTEM_INSTRUCTIONS,
+                doc_format=document_format.value,
+                doc_type=document_type.value,
+                language=language.value,
+                raw_text=raw_text,
+            )
+
             response = self.model.generate_content(correction_prompt)  # Use self.model instead of self.client
             return response.text if hasattr(response, "text") else raw_text
         except Exception as e:
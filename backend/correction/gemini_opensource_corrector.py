@@ -3,13 +3,46 @@ GeminiOpensource Correction Provider for Google Gemini models
 Supports models that implement 'generateContent'
 """
 
-import google.generativeai as genai
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from backend.config import logger
+from backend.correction._prompts import build_correction_prompt
+from backend.correction._utils import strip_response_prefixes
 from backend.correction.base import BaseCorrectionProvider
+from backend.correction.gemini_corrector import _get_gemini_model
 from backend.models.enums import DocumentType, DocumentFormat, Language
 
 
+@lru_cache(maxsize=4)
+def _list_gemini_models(api_key: str) -> Tuple[str, ...]:
+    """generateContent-capable model names, fetched once per API key."""
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return tuple(model.name for model in genai.list_models() if
+                 'generateContent' in model.supported_generation_methods)
+
+
+# Small segments are packed into one request under this many characters, delimited by SEG markers
+_PACK_MAX_CHARS = 6000
+_SEG_RE = re.compile(r"^[ \t]*---SEG (\d+)---[ \t]*$", re.MULTILINE)
+
+
+def _split_segments(response: str, group: List[int]) -> Optional[Dict[int, str]]:
+    """
+    Split a packed answer back into {segment index: cleaned text}, with each part cleaned the way
+    correct_text cleans a single answer. None when the markers don't match `group` one-to-one.
+    """
+    parts = _SEG_RE.split(response)
+    pairs = [(int(parts[k]), strip_response_prefixes(parts[k + 1])) for k in range(1, len(parts) - 1, 2)]
+    segments = dict(pairs)
+    if len(pairs) != len(group) or set(segments) != set(group):
+        return None
+    return segments
+
+
 class GeminiOpensourceCorrectionProvider(BaseCorrectionProvider):
     """Gemini provider for text correction using generative models"""
 
@@ -18,21 +51,16 @@ class GeminiOpensourceCorrectionProvider(BaseCorrectionProvider):
         self.__gemini_model = model
         self.available_models = []
         self.client = None
-        # Call parent initializer
+        # Call parent initializer, which configures the provider
         super().__init__(api_key=api_key)
         logger.debug(f"Initialized GeminiOpensourceCorrectionProvider with model: {self.__gemini_model}")
-        # Configure after parent initialization
-        self.configure()
 
     def configure(self):
         """Configure the Gemini connection and select an appropriate model"""
         try:
             logger.debug(f"Configuring with model: {self.__gemini_model}")
-            genai.configure(api_key=self.api_key)
-            # Fetch available models
-            models = genai.list_models()
-            self.available_models = [model.name for model in models if
-                                     'generateContent' in model.supported_generation_methods]
+            # Fetch available models (cached per API key)
+            self.available_models = list(_list_gemini_models(self.api_key))
             logger.info(f"Available Gemini models for correction: {self.available_models}")
 
             # Check if selected model is available
@@ -49,7 +77,7 @@ class GeminiOpensourceCorrectionProvider(BaseCorrectionProvider):
                     raise ValueError(f"No suitable correction model found. Available: {self.available_models}")
 
             # Initialize the model
-            self.client = genai.GenerativeModel(self.__gemini_model)
+            self.client = _get_gemini_model(self.api_key, self.__gemini_model)
             logger.debug(f"Model initialized: {self.__gemini_model}")
         except Exception as e:
             logger.error(f"Failed to configure Gemini API: {str(e)}")
@@ -80,44 +108,59 @@ class GeminiOpensourceCorrectionProvider(BaseCorrectionProvider):
             logger.error(f"Gemini correction error: {e}")
             return raw_text
 
+    def correct_batch(self, texts: List[str], document_type: DocumentType,
+                      document_format: DocumentFormat, language: Language) -> List[str]:
+        """Pack consecutive small segments into shared requests and split the answer back out"""
+        results: List[str] = list(texts)
+        group: List[int] = []
+        size = 0
+        for i, text in enumerate(texts):
+            if group and size + len(text) > _PACK_MAX_CHARS:
+                self._correct_group(texts, group, results, document_type, document_format, language)
+                group, size = [], 0
+            group.append(i)
+            size += len(text)
+        if group:
+            self._correct_group(texts, group, results, document_type, document_format, language)
+        return results
+
+    def _correct_group(self, texts: List[str], group: List[int], results: List[str],
+                       document_type: DocumentType, document_format: DocumentFormat, language: Language) -> None:
+        if len(group) == 1:
+            i = group[0]
+            results[i] = self.correct_text(texts[i], document_type, document_format, language)
+            return
+        packed = "\n".join(f"---SEG {i}---\n{texts[i]}" for i in group)
+        prompt = build_correction_prompt(packed, document_format.value, document_type.value, language,
+                                         segmented=True)
+        try:
+            response = self.client.generate_content(
+                prompt,
+                generation_config={
+                    "temperature": 0.1,
+                    "top_p": 0.9,
+                    "top_k": 40
+                }
+            )
+            segments = _split_segments(response.text, group)
+        except Exception as e:
+            logger.error(f"Gemini batch correction error: {e}")
+            segments = None
+        if segments is None:
+            # Model dropped or mangled markers; fall back to one request per segment
+            logger.warning("Gemini batch correction returned mismatched segments, correcting individually")
+            for i in group:
+                results[i] = self.correct_text(texts[i], document_type, document_format, language)
+            return
+        for i in group:
+            results[i] = segments[i]
+
     def _create_correction_prompt(self, raw_text: str, document_type: DocumentType,
                                   document_format: DocumentFormat, language: Language) -> str:
         """Create correction prompt based on document type, format, and language"""
-        language_instruction = ""
-        if language == Language.NEPALI:
-            language_instruction = "The text contains Nepali language. Ensure proper Devanagari script accuracy."
-        elif language == Language.ENGLISH:
-            language_instruction = "The text is in English. Focus on English spelling and grammar."
-
-        prompt = f"""You are an expert text correction AI. Your task is to correct OCR errors in text extracted from a {document_format.value} {document_type.value} document.
-
-        {language_instruction}
-        
-        Instructions:
-        1. Correct spelling mistakes and OCR errors
-        2. Fix formatting issues while preserving original structure
-        3. Preserve mathematical expressions in LaTeX format
-        4. Replace phrases like "Dx heads towards 0" with proper limit notation
-        5. Maintain all original information - do not add or remove content
-        6. Output ONLY the corrected text in markdown, no explanations
-        
-        Original OCR Text:
-        {raw_text}
-        
-        Corrected Text:"""
-        return prompt
+        return build_correction_prompt(raw_text, document_format.value, document_type.value, language)
 
     @staticmethod
     def _clean_response(response: str) -> str:
         """Clean the response by removing common prefixes"""
-        prefixes_to_remove = [
-            "Corrected Text:",
-            "Here is the corrected text:",
-            "The corrected text is:",
-            "Corrected version:",
-        ]
-        cleaned = response.strip()
-        for prefix in prefixes_to_remove:
-            if cleaned.startswith(prefix):
-                cleaned = cleaned[len(prefix):].strip()
-        return cleaned
+        return strip_response_prefixes(response)
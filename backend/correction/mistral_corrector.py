@@ -1,20 +1,34 @@
 import logging
-from mistralai import Mistral
+from functools import lru_cache
+from typing import List
 
 from backend.config import logger
 from backend.correction.base import BaseCorrectionProvider
 from backend.models.enums import DocumentType, Language, DocumentFormat
 
+_SYSTEM_TMPL = """You are an AI that corrects OCR text from {doc_format} {doc_type} documents.
+                    Instructions:
+                    - Correct spelling and formatting errors while preserving original document_content and structure.
+                    - Preserve mathematical expressions in LaTeX format 
+                    - Replace phrases like "Dx heads towards 0" with proper limit notation
+                    - Output only the corrected text in markdown, no explanations."""
+
+
+@lru_cache(maxsize=32)
+def _system_prompt(doc_format: str, doc_type: str) -> str:
+    return _SYSTEM_TMPL.format(doc_format=doc_format, doc_type=doc_type)
+
 
 class MistralCorrectionProvider(BaseCorrectionProvider):
     def __init__(self, api_key: str, model: str = "mistral-small-latest"):
-        super().__init__(api_key)
         self.model = model
-        self.client = None
-        self.configure()
+        super().__init__(api_key)  # Parent __init__ calls configure()
 
     def configure(self):
         try:
+            # SDK is imported on first use so processes that never pick Mistral don't load it
+            from mistralai import Mistral
+
             self.client = Mistral(api_key=self.api_key)
         except Exception as e:
             logger.error(f"Failed to configure Mistral client: {e}")
@@ -23,19 +37,15 @@ class MistralCorrectionProvider(BaseCorrectionProvider):
     def correct_text(self, raw_text: str, document_type: DocumentType,
                      document_format: DocumentFormat, language: Language) -> str:
         try:
+            df, dt, lang = document_format.value, document_type.value, language.value
             messages = [
                 {
                     "role": "system",
-                    "content": f"""You are an AI that corrects OCR text from {document_format.value} {document_type.value} documents.
-                    Instructions:
-                    - Correct spelling and formatting errors while preserving original document_content and structure.
-                    - Preserve mathematical expressions in LaTeX format 
-                    - Replace phrases like "Dx heads towards 0" with proper limit notation
-                    - Output only the corrected text in markdown, no explanations."""
+                    "content": _system_prompt(df, dt)
                 },
                 {
                     "role": "user",
-                    "content": f"Correct this OCR text (language: {language.value}):\n\n{raw_text}"
+                    "content": f"Correct this OCR text (language: {lang}):\n\n{raw_text}"
                 }
             ]
 
@@ -49,3 +59,8 @@ class MistralCorrectionProvider(BaseCorrectionProvider):
         except Exception as e:
             logger.error(f"Mistral correction error: {e}")
             return raw_text
+
+    def correct_batch(self, texts: List[str], document_type: DocumentType,
+                      document_format: DocumentFormat, language: Language) -> List[str]:
+        # The SDK's sync client is thread-safe, so overlap the round trips on a small pool
+        return self._correct_concurrently(texts, document_type, document_format, language, max_workers=4)
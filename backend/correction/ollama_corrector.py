@@ -1,12 +1,56 @@
+import json
 import logging
-import requests
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from backend.core.config import settings
+from backend.correction._prompts import build_correction_prompt
+from backend.correction._utils import strip_response_prefixes
 from backend.correction.base import BaseCorrectionProvider
 from backend.models.enums import DocumentType, DocumentFormat, Language
 
 logger = logging.getLogger(__name__)
 
+# Concurrent /api/generate calls per batch; Ollama queues the rest server-side anyway
+_BATCH_CONCURRENCY = 4
+
+# Pooled keep-alive clients shared by every provider instance; the async one serves the
+# FastAPI event loop, the sync one the legacy document processors running in worker threads
+_ollama_client: Optional[httpx.AsyncClient] = None
+_ollama_sync_client: Optional[httpx.Client] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _ollama_client
+    if _ollama_client is None or _ollama_client.is_closed:
+        _ollama_client = httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_keepalive_connections=20))
+    return _ollama_client
+
+
+def _get_sync_client() -> httpx.Client:
+    global _ollama_sync_client
+    if _ollama_sync_client is None or _ollama_sync_client.is_closed:
+        _ollama_sync_client = httpx.Client(timeout=60, limits=httpx.Limits(max_keepalive_connections=20))
+    return _ollama_sync_client
+
+
+async def close_ollama_client() -> None:
+    global _ollama_client, _ollama_sync_client
+    if _ollama_client is not None:
+        await _ollama_client.aclose()
+        _ollama_client = None
+    if _ollama_sync_client is not None:
+        _ollama_sync_client.close()
+        _ollama_sync_client = None
+
 
 class OllamaCorrectionProvider(BaseCorrectionProvider):
 
@@ -14,17 +58,14 @@ class OllamaCorrectionProvider(BaseCorrectionProvider):
         # Set attributes BEFORE calling parent class's __init__
         self.endpoint = endpoint.rstrip('/')
         self.model = model
-        super().__init__(api_key="")  # No API key needed
-        self.client = None
-        # Now configure the connection
-        self.configure()
+        super().__init__(api_key="")  # No API key needed; parent __init__ calls configure()
 
     def configure(self):
         self.client = self
         try:
-            response = requests.get(f"{self.endpoint}/api/tags", timeout=10)
+            response = _get_sync_client().get(f"{self.endpoint}/api/tags", timeout=10)
             if response.status_code == 200:
-                available_models = [model["name"] for model in response.json().get("models", [])]
+                available_models = [model["name"] for model in _json_loads(response.content).get("models", [])]
                 logger.info(f"Correction: Available Ollama models for correction: {available_models}")
 
                 if self.model not in available_models:
@@ -39,78 +80,62 @@ class OllamaCorrectionProvider(BaseCorrectionProvider):
                         raise ValueError(f"No suitable correction model found. Available: {available_models}")
             else:
                 raise ConnectionError(f"Failed to connect to Ollama at {self.endpoint}")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             raise ConnectionError(f"Cannot connect to Ollama at {self.endpoint}: {str(e)}")
 
-    def correct_text(self, raw_text: str, document_type: DocumentType,
-                     document_format: DocumentFormat, language: Language) -> str:
-        try:
-            prompt = self._create_correction_prompt(raw_text, document_type, document_format, language)
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.1,
-                    "top_p": 0.9,
-                    "top_k": 40,
-                    "repeat_penalty": 1.1
-                }
+    def _build_payload(self, raw_text: str, document_type: DocumentType,
+                       document_format: DocumentFormat, language: Language) -> Dict[str, Any]:
+        prompt = self._create_correction_prompt(raw_text, document_type, document_format, language)
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": "5m",
+            "options": {
+                "temperature": 0.1,
+                "top_p": 0.9,
+                "top_k": 40,
+                "repeat_penalty": 1.1
             }
+        }
 
-            response = requests.post(
-                f"{self.endpoint}/api/generate",
-                json=payload,
-                timeout=60
-            )
+    def _handle_response(self, response: httpx.Response, raw_text: str) -> str:
+        if response.status_code == 200:
+            result = _json_loads(response.content)
+            corrected_text = result.get("response", raw_text)
+            return self._clean_response(corrected_text)
+        logger.error(f"Ollama correction API error: {response.status_code}")
+        return raw_text
 
-            if response.status_code == 200:
-                result = response.json()
-                corrected_text = result.get("response", raw_text)
-                return self._clean_response(corrected_text)
-            else:
-                logger.error(f"Ollama correction API error: {response.status_code}")
-                return raw_text
+    async def correct_text_async(self, raw_text: str, document_type: DocumentType,
+                                 document_format: DocumentFormat, language: Language) -> str:
+        try:
+            payload = self._build_payload(raw_text, document_type, document_format, language)
+            response = await _get_client().post(f"{self.endpoint}/api/generate", json=payload)
+            return self._handle_response(response, raw_text)
+        except Exception as e:
+            logger.error(f"Ollama correction error: {e}")
+            return raw_text
+
+    def correct_text(self, raw_text: str, document_type: DocumentType,
+                     document_format: DocumentFormat, language: Language) -> str:
+        try:
+            payload = self._build_payload(raw_text, document_type, document_format, language)
+            response = _get_sync_client().post(f"{self.endpoint}/api/generate", json=payload)
+            return self._handle_response(response, raw_text)
         except Exception as e:
             logger.error(f"Ollama correction error: {e}")
             return raw_text
 
+    def correct_batch(self, texts: List[str], document_type: DocumentType,
+                      document_format: DocumentFormat, language: Language) -> List[str]:
+        return self._correct_concurrently(texts, document_type, document_format, language,
+                                          max_workers=_BATCH_CONCURRENCY)
+
     def _create_correction_prompt(self, raw_text: str, document_type: DocumentType,
                                   document_format: DocumentFormat, language: Language) -> str:
-        language_instruction = ""
-        if language == Language.NEPALI:
-            language_instruction = "The text contains Nepali language. Ensure proper Devanagari script accuracy."
-        elif language == Language.ENGLISH:
-            language_instruction = "The text is in English. Focus on English spelling and grammar."
-
-        prompt = f"""You are an expert text correction AI. Your task is to correct OCR errors in text extracted from a {document_format.value} {document_type.value} document.
-
-        {language_instruction}
-        
-        Instructions:
-        1. Correct spelling mistakes and OCR errors
-        2. Fix formatting issues while preserving original structure
-        3. Preserve mathematical expressions in LaTeX format
-        4. Replace phrases like "Dx heads towards 0" with proper limit notation
-        5. Maintain all original information - do not add or remove content
-        6. Output ONLY the corrected text in markdown, no explanations
-        
-        Original OCR Text:
-        {raw_text}
-        
-        Corrected Text:"""
-        return prompt
+        return build_correction_prompt(raw_text, document_format.value, document_type.value, language)
 
     @staticmethod
     def _clean_response(response: str) -> str:
-        prefixes_to_remove = [
-            "Corrected Text:",
-            "Here is the corrected text:",
-            "The corrected text is:",
-            "Corrected version:",
-        ]
-        cleaned = response.strip()
-        for prefix in prefixes_to_remove:
-            if cleaned.startswith(prefix):
-                cleaned = cleaned[len(prefix):].strip()
-        return cleaned
+        return strip_response_prefixes(response)
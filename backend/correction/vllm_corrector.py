@@ -2,13 +2,96 @@
 VLLM Correction Provider for VLLM-based models
 Supports models that implement OpenAI-compatible chat completions endpoint
 """
+import asyncio
+import hashlib
+import json
 import logging
-import requests
-from typing import List
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
+try:
+    import h2  # noqa: F401  (lets httpx negotiate HTTP/2 over TLS)
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
 
 from backend.config import logger
+from backend.correction._prompts import build_correction_prompt
+from backend.correction._utils import strip_response_prefixes
 from backend.correction.base import BaseCorrectionProvider
 from backend.models.enums import DocumentType, DocumentFormat, Language
+from backend.utils.cache import LRUCache
+
+# Concurrent in-flight corrections per provider; vLLM's continuous batcher coalesces them
+_MAX_IN_FLIGHT = 16
+_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Transient scheduler backpressure is retried with full-jitter exponential backoff
+_RETRY_STATUS = frozenset({429, 502, 503, 504})
+_RETRY_ATTEMPTS = 4
+_BACKOFF_BASE = 0.2
+_BACKOFF_MAX = 4.0
+# After this many consecutive failed corrections, skip the server for the cooldown period
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+
+# Process-wide pools keyed by (server_url, api_key), shared by every provider instance
+_CLIENTS: Dict[Tuple[str, str], httpx.Client] = {}
+_ACLIENTS: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_clients(server_url: str, api_key: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    key = (server_url, api_key)
+    with _clients_lock:
+        client = _CLIENTS.get(key)
+        if client is None:
+            headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+            client = _CLIENTS[key] = httpx.Client(
+                base_url=server_url, headers=headers, http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT)
+            _ACLIENTS[key] = httpx.AsyncClient(
+                base_url=server_url, headers=headers, http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT)
+        return client, _ACLIENTS[key]
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_BASE * (2 ** attempt)))
+
+
+async def close_vllm_clients():
+    """Close the shared vLLM correction pools on application shutdown"""
+    with _clients_lock:
+        clients = list(_CLIENTS.values())
+        aclients = list(_ACLIENTS.values())
+        _CLIENTS.clear()
+        _ACLIENTS.clear()
+    for client in clients:
+        client.close()
+    for aclient in aclients:
+        await aclient.aclose()
 
 
 class VLLMCorrectionProvider(BaseCorrectionProvider):
@@ -19,19 +102,27 @@ class VLLMCorrectionProvider(BaseCorrectionProvider):
         self.__vllm_model = model
         self.server_url = server_url
         self.available_models = []
-        self.client = None
+        self.client: Optional[httpx.Client] = None
+        self.aclient: Optional[httpx.AsyncClient] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        # Repeated chunks (page boilerplate, retries) skip the round trip; decoding is near-greedy
+        self._cache = LRUCache(maxsize=1024)
+        self._breaker_lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._breaker_open_until = 0.0
         super().__init__(api_key=api_key)
         logger.debug(f"Initialized VLLMCorrectionProvider with model: {self.__vllm_model}, server: {self.server_url}")
-        self.configure()
 
     def configure(self):
         """Configure the VLLM connection and fetch available models"""
         try:
             logger.debug(f"Configuring with model: {self.__vllm_model}")
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-            response = requests.get(f"{self.server_url}/models", headers=headers, timeout=10)
-            response.raise_for_status()
-            self.available_models = [model["id"] for model in response.json().get("data", [])]
+            # Keep-alive pools: the sync one for the document processors, the async one for the API
+            self.client, self.aclient = _get_clients(self.server_url, self.api_key)
+            self._sem = asyncio.Semaphore(_MAX_IN_FLIGHT)
+
+            response = self._request("GET", "/models", timeout=10)
+            self.available_models = [model["id"] for model in _json_loads(response.content).get("data", [])]
             logger.info(f"Available VLLM models for correction: {self.available_models}")
 
             if self.__vllm_model not in self.available_models:
@@ -44,8 +135,6 @@ class VLLMCorrectionProvider(BaseCorrectionProvider):
                 else:
                     raise ValueError(f"No suitable correction model found. Available: {self.available_models}")
 
-            self.client = requests.Session()
-            self.client.headers.update({"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"})
             logger.debug(f"Model initialized: {self.__vllm_model}")
 
         except Exception as e:
@@ -57,73 +146,133 @@ class VLLMCorrectionProvider(BaseCorrectionProvider):
         """Getter for model attribute"""
         return self.__vllm_model
 
+    def _build_payload(self, raw_text: str, document_type: DocumentType,
+                       document_format: DocumentFormat, language: Language) -> Dict[str, Any]:
+        prompt = self._create_correction_prompt(raw_text, document_type, document_format, language)
+        return {
+            "model": self.__vllm_model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,
+            "top_p": 0.9,
+            "max_tokens": 1024
+        }
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transport errors and 429/5xx backpressure responses"""
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                response = self.client.request(method, path, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                if attempt == _RETRY_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise
+                delay = _backoff(attempt)
+                logger.warning(f"VLLM {method} {path} failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    async def _arequest(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Async twin of _request; the in-flight slot is released while backing off"""
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                async with self._sem:
+                    response = await self.aclient.request(method, path, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                if attempt == _RETRY_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise
+                delay = _backoff(attempt)
+                logger.warning(f"VLLM {method} {path} failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def _breaker_open(self) -> bool:
+        return time.monotonic() < self._breaker_open_until
+
+    def _record_result(self, ok: bool):
+        with self._breaker_lock:
+            if ok:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= _BREAKER_THRESHOLD:
+                self._breaker_open_until = time.monotonic() + _BREAKER_COOLDOWN
+                self._consecutive_failures = 0
+                logger.warning(f"VLLM correction circuit open for {_BREAKER_COOLDOWN:.0f}s after repeated failures")
+
+    @staticmethod
+    def _cache_key(payload: Dict[str, Any]) -> tuple:
+        prompt = payload["messages"][0]["content"]
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+        return payload["model"], payload["temperature"], payload["top_p"], payload["max_tokens"], digest
+
+    def _prepare(self, raw_text: str, document_type: DocumentType, document_format: DocumentFormat,
+                 language: Language) -> Union[str, Tuple[bytes, tuple]]:
+        """
+        Request body and cache key for a correction, or the text to return without a request:
+        a cached correction, or raw_text while the circuit is open
+        """
+        logger.debug(f"Correcting text with model: {self.__vllm_model}")
+        payload = self._build_payload(raw_text, document_type, document_format, language)
+        key = self._cache_key(payload)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        if self._breaker_open():
+            return raw_text
+        return _json_dumps(payload), key
+
+    def _finish(self, key: tuple, response: httpx.Response) -> str:
+        corrected_text = self._clean_response(_json_loads(response.content)["choices"][0]["message"]["content"])
+        self._record_result(True)
+        self._cache.set(key, corrected_text)
+        return corrected_text
+
+    def _fail(self, raw_text: str, error: Exception) -> str:
+        self._record_result(False)
+        logger.error(f"VLLM correction error: {error}")
+        return raw_text
+
+    async def correct_text_async(self, raw_text: str, document_type: DocumentType,
+                                 document_format: DocumentFormat, language: Language) -> str:
+        """Correct text without blocking the event loop; concurrent calls share the async pool"""
+        try:
+            prepared = self._prepare(raw_text, document_type, document_format, language)
+            if isinstance(prepared, str):
+                return prepared
+            body, key = prepared
+            return self._finish(key, await self._arequest("POST", "/chat/completions", content=body))
+        except Exception as e:
+            return self._fail(raw_text, e)
+
     def correct_text(self, raw_text: str, document_type: DocumentType,
                      document_format: DocumentFormat, language: Language) -> str:
         """Correct text using VLLM model"""
         try:
-            logger.debug(f"Correcting text with model: {self.__vllm_model}")
-            prompt = self._create_correction_prompt(raw_text, document_type, document_format, language)
-
-            payload = {
-                "model": self.__vllm_model,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.1,
-                "top_p": 0.9,
-                "max_tokens": 1024
-            }
-
-            response = self.client.post(f"{self.server_url}/chat/completions", json=payload, timeout=30)
-            response.raise_for_status()
-            corrected_text = response.json()["choices"][0]["message"]["content"]
-            return self._clean_response(corrected_text)
-
+            prepared = self._prepare(raw_text, document_type, document_format, language)
+            if isinstance(prepared, str):
+                return prepared
+            body, key = prepared
+            return self._finish(key, self._request("POST", "/chat/completions", content=body))
         except Exception as e:
-            logger.error(f"VLLM correction error: {e}")
-            return raw_text
+            return self._fail(raw_text, e)
+
+    def correct_batch(self, texts: List[str], document_type: DocumentType,
+                      document_format: DocumentFormat, language: Language) -> List[str]:
+        return self._correct_concurrently(texts, document_type, document_format, language,
+                                          max_workers=_MAX_IN_FLIGHT)
 
     def _create_correction_prompt(self, raw_text: str, document_type: DocumentType,
                                   document_format: DocumentFormat, language: Language) -> str:
         """Create correction prompt based on document type, format, and language"""
-        language_instruction = ""
-        if language == Language.NEPALI:
-            language_instruction = "The text contains Nepali language. Ensure proper Devanagari script accuracy."
-        elif language == Language.ENGLISH:
-            language_instruction = "The text is in English. Focus on English spelling and grammar."
-
-        prompt = f"""You are an expert text correction AI. Your task is to correct OCR errors in text extracted from a {document_format.value} {document_type.value} document.
-
-        {language_instruction}
-
-        Instructions:
-        1. Correct spelling mistakes and OCR errors
-        2. Fix formatting issues while preserving original structure
-        3. Preserve mathematical expressions in LaTeX format
-        4. Replace phrases like "Dx heads towards 0" with proper limit notation
-        5. Maintain all original information - do not add or remove content
-        6. Output ONLY the corrected text in markdown, no explanations
-
-        Original OCR Text:
-        {raw_text}
-
-        Corrected Text:"""
-        return prompt
+        return build_correction_prompt(raw_text, document_format.value, document_type.value, language)
 
     @staticmethod
     def _clean_response(response: str) -> str:
         """Clean the response by removing common prefixes"""
-        prefixes_to_remove = [
-            "Corrected Text:",
-            "Here is the corrected text:",
-            "The corrected text is:",
-            "Corrected version:",
-        ]
-        cleaned = response.strip()
-        for prefix in prefixes_to_remove:
-            if cleaned.startswith(prefix):
-                cleaned = cleaned[len(prefix):].strip()
-        return cleaned
+        return strip_response_prefixes(response)
 
     def list_available_models(self) -> List[str]:
         """List all available models in VLLM API"""
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
 import base64
-import io
-import tempfile
-from pathlib import Path
-from typing import Callable, Dict, List, Optional, Any
-
-from PyPDF2 import PdfReader
-from pdf2image import convert_from_bytes
+import operator
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Any
 
 from backend.config import logger
+from backend.correction._utils import split_paragraph_chunks
+from backend.correction.base import BaseCorrectionProvider
 from backend.models.enums import (
     OCRProvider,
     CorrectionProvider,
@@ -18,10 +17,16 @@ from backend.models.enums import (
     Language,
 )
 from backend.models.schemas import OCRResult
+from backend.ocr.base import image_mime_type
 from backend.ocr.ocr_provider_factory import OCRProviderFactory
-from backend.utils.helper.image_segmentation import segment_image_for_ocr
 from backend.utils.ui_helpers import parse_corrected_markdown
 
+if TYPE_CHECKING:
+    from PIL import Image
+
+# PyMuPDF and the OpenCV-based segmentation helpers are imported in the branches that use them,
+# so image-only and non-segmented requests (and worker start-up) never load them
+
 
 def _emit_progress(cb: Optional[Callable[[int, str], None]], pct: int, msg: str) -> None:
     if cb:
@@ -34,18 +39,56 @@ def _emit_progress(cb: Optional[Callable[[int, str], None]], pct: int, msg: str)
     logger.info("[progress %d%%] %s", pct, msg)
 
 
+# Page/region OCR calls kept in flight while later pages are still rendering
+_OCR_PIPELINE_DEPTH = 4
+
+
+def _as_pil_image(image: Image.Image) -> Image.Image:
+    return image
+
+
+def _iter_pdf_pages(file_bytes: bytes, max_pages: int, dpi: int,
+                    encode: Optional[Callable[[Image.Image], Any]] = None) -> Iterator[Any]:
+    """
+    Yield the first `max_pages` pages one at a time, rendered in-process with PyMuPDF (no Poppler
+    subprocess). Pages are JPEG bytes straight from MuPDF unless `encode` is given (e.g. the OCR
+    provider's WebP encoder, or _as_pil_image for the decoded page). Only one page's pixmap is alive at once.
+    MuPDF documents are not thread-safe, so rendering stays on the calling thread.
+    """
+    import fitz
+    from PIL import Image
+
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        for i in range(min(doc.page_count, max_pages)):
+            pix = doc.load_page(i).get_pixmap(dpi=dpi)
+            if encode is None:
+                yield pix.tobytes("jpeg", jpg_quality=75)
+            else:
+                yield encode(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+
+
+def _overlaps_requests(corrector: BaseCorrectionProvider) -> bool:
+    """True when the provider overrides correct_batch to overlap or pack its requests."""
+    return type(corrector).correct_batch is not BaseCorrectionProvider.correct_batch
+
+
 def _normalize_ocr_result(ocr_result: Any) -> OCRResult:
     """
     Accept either OCRResult (preferred) or a structured enum-like holder
     and return an OCRResult instance.
     """
+    # Common case: providers already return OCRResult, skip the lazy imports and attribute copying
+    if type(ocr_result) is OCRResult:
+        return ocr_result
+
     from backend.models.schemas import OCRResult as OCRResultSchema
     from backend.models.enums import StructuredOCRResult as StructuredOCRResultEnum
 
     if isinstance(ocr_result, OCRResultSchema):
         return ocr_result
     elif isinstance(ocr_result, StructuredOCRResultEnum):
-        return OCRResultSchema(
+        # fields were validated when the StructuredOCRResult was built; skip re-validating them
+        return OCRResultSchema.model_construct(
             raw_text=getattr(ocr_result, "raw_text", None),
             corrected_text=getattr(ocr_result, "corrected_text", None),
             structured_data=getattr(ocr_result, "structured_data", None),
@@ -57,6 +100,19 @@ def _normalize_ocr_result(ocr_result: Any) -> OCRResult:
         raise TypeError(f"Unexpected OCR result type: {type(ocr_result)}")
 
 
+# type -> serializer picked on first sight, so repeat calls skip the hasattr probing
+_SERIALIZERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _pick_serializer(obj: Any) -> Callable[[Any], Any]:
+    for attr in ("model_dump", "dict"):
+        if hasattr(obj, attr):
+            return operator.methodcaller(attr)
+    if hasattr(obj, "__dict__"):
+        return lambda o: dict(o.__dict__)
+    return lambda o: o
+
+
 def _to_dict(obj: Any) -> Any:
     """
     Best-effort conversion to JSON-serializable dict.
@@ -64,6 +120,18 @@ def _to_dict(obj: Any) -> Any:
     """
     if obj is None:
         return None
+    t = type(obj)
+    fn = _SERIALIZERS.get(t)
+    if fn is None:
+        fn = _SERIALIZERS[t] = _pick_serializer(obj)
+    try:
+        return fn(obj)
+    except Exception:
+        return _to_dict_probe(obj)
+
+
+def _to_dict_probe(obj: Any) -> Any:
+    """Slow path: try each conversion in turn when the cached serializer fails."""
     for attr in ("model_dump", "dict"):
         if hasattr(obj, attr):
             try:
@@ -116,87 +184,144 @@ class DocumentProcessor:
         """
         _emit_progress(progress_callback, 10, "Initializing document processing")
 
-        # Create OCR provider instance
-        logger.info("Creating OCR provider: %s", ocr_provider)
-        ocr = OCRProviderFactory.create_provider(ocr_provider, **provider_kwargs)
-        if ocr is None:
-            raise RuntimeError(f"Failed to initialize OCR provider: {ocr_provider}")
+        def _get_ocr():
+            # Created only when images actually need OCR; text PDFs never pay for provider setup
+            logger.info("Creating OCR provider: %s", ocr_provider)
+            ocr = OCRProviderFactory.create_provider(ocr_provider, **provider_kwargs)
+            if ocr is None:
+                raise RuntimeError(f"Failed to initialize OCR provider: {ocr_provider}")
+            return ocr
+
+        corrector_slot: List[Any] = []
+
+        def _get_corrector():
+            # Built at most once per call; the PDF OCR pipeline may need it before OCR finishes
+            if not corrector_slot:
+                logger.info("Creating correction provider: %s", correction_provider)
+                from backend.correction.correction_provider_factory import CorrectionProviderFactory
+
+                corrector_slot.append(CorrectionProviderFactory.create_provider(correction_provider,
+                                                                                **provider_kwargs))
+            return corrector_slot[0]
 
         ocr_results: List[OCRResult] = []
+        # Per-page corrections started while later pages were still in OCR (PDF fallback only)
+        speculative_pages: Optional[List[str]] = None
         pages_processed = 0
 
         if file_type.startswith("image/"):
             _emit_progress(progress_callback, 20, "Processing image")
+            ocr = _get_ocr()
             if use_segmentation:
-                with tempfile.TemporaryDirectory() as td:
-                    temp_image_path = Path(td) / "image_for_seg.jpg"
-                    temp_image_path.write_bytes(file_bytes)
+                from backend.utils.helper.image_segmentation import segment_image_for_ocr_bytes
 
-                    seg_result = segment_image_for_ocr(temp_image_path, vision_enabled=True)
+                seg_result = segment_image_for_ocr_bytes(file_bytes, vision_enabled=True)
 
-                    # Iterate over detected regions and OCR each region
-                    for region in seg_result.get("region_images", []):
-                        img_bytes = io.BytesIO()
-                        region["pil_image"].save(img_bytes, format="JPEG")
-                        r = ocr.extract_text(img_bytes.getvalue(), document_type, document_format)
-                        ocr_results.append(_normalize_ocr_result(r))
+                # Encode every detected region, then OCR them as one batch
+                region_jobs = [ocr.encode_image(region["pil_image"])
+                               for region in seg_result.get("region_images", [])]
+                for r in ocr.extract_text_batch(region_jobs, document_type, document_format):
+                    ocr_results.append(_normalize_ocr_result(r))
 
-                    pages_processed = 1
+                pages_processed = 1
             else:
-                r = ocr.extract_text(file_bytes, document_type, document_format)
+                r = ocr.extract_text_cached(file_bytes, document_type, document_format)
                 ocr_results.append(_normalize_ocr_result(r))
                 pages_processed = 1
 
         elif file_type == "application/pdf":
             _emit_progress(progress_callback, 20, "Processing PDF")
-            try:
-                pdf_reader = PdfReader(io.BytesIO(file_bytes))
-                total_pages = len(pdf_reader.pages)
-                pages_to_process = min(total_pages, max_pdf_pages)
+            import fitz
 
-                # Try fast text extraction first
+            try:
+                # Try fast text extraction first; MuPDF's extractor is native code, unlike
+                # PyPDF2's pure-Python content-stream walk
                 raw_text_chunks: List[str] = []
-                for idx, page in enumerate(pdf_reader.pages[:pages_to_process], 1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        raw_text_chunks.append(page_text)
+                with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+                    total_pages = doc.page_count
+                    pages_to_process = min(total_pages, max_pdf_pages)
+                    for i in range(pages_to_process):
+                        page_text = doc.load_page(i).get_text()
+                        if page_text:
+                            raw_text_chunks.append(page_text)
                 if raw_text_chunks:
                     ocr_results.append(
-                        OCRResult(
+                        OCRResult.model_construct(
                             raw_text="\n".join(raw_text_chunks).strip(),
-                            provider_used="pypdf2",
+                            provider_used="pymupdf",
                             language_detected="auto_detected",
                         )
                     )
                     pages_processed = pages_to_process
                 else:
-                    # Fallback: render pages to images and OCR each
-                    images = convert_from_bytes(file_bytes, dpi=pdf_dpi, size=(None, None))
-                    for i, image in enumerate(images[:pages_to_process]):
-                        _emit_progress(
-                            progress_callback,
-                            20 + (i + 1) * 30 // pages_to_process,
-                            f"OCR on PDF page {i + 1}/{pages_to_process}",
-                        )
-                        img_byte_arr = io.BytesIO()
-                        image.save(img_byte_arr, format="JPEG")
-                        img_bytes = img_byte_arr.getvalue()
+                    # Fallback: render pages one at a time on this thread and hand each page
+                    # (or its segmented regions) to the OCR pool right away, so rendering of
+                    # page N+1 overlaps OCR of page N. The semaphore bounds in-flight jobs.
+                    ocr = _get_ocr()
+                    slots = threading.BoundedSemaphore(_OCR_PIPELINE_DEPTH)
+                    futures: List[Future] = []
+
+                    # Whole pages are corrected as soon as their OCR lands, overlapping correction
+                    # latency with OCR of the remaining pages. Regions are too small to correct alone,
+                    # and sequential providers keep correcting the combined text once at the end.
+                    corrector = None
+                    if correction_provider != CorrectionProvider.NONE and not use_segmentation:
+                        corrector = _get_corrector()
+                        if corrector is not None and not _overlaps_requests(corrector):
+                            corrector = None
+                    corrections: List[Optional[Future]] = []
+
+                    def _correct_page(text: str) -> str:
+                        chunks = split_paragraph_chunks(text)
+                        return "\n\n".join(
+                            corrector.correct_batch(chunks, document_type, document_format, language))
+
+                    # the OCR pool shuts down first, so every speculation is submitted before cpool closes
+                    with ThreadPoolExecutor(max_workers=_OCR_PIPELINE_DEPTH) as cpool, \
+                            ThreadPoolExecutor(max_workers=_OCR_PIPELINE_DEPTH) as pool:
+                        def _speculate(idx: int, fut: Future) -> None:
+                            if fut.exception() is None:
+                                text = _normalize_ocr_result(fut.result()).raw_text
+                                if text and text.strip():
+                                    corrections[idx] = cpool.submit(_correct_page, text.strip())
+
+                        def _submit(extract: Callable, job: Any) -> None:
+                            slots.acquire()
+                            fut = pool.submit(extract, job, document_type, document_format)
+                            fut.add_done_callback(lambda _f: slots.release())
+                            if corrector is not None:
+                                corrections.append(None)
+                                fut.add_done_callback(lambda f, idx=len(futures): _speculate(idx, f))
+                            futures.append(fut)
 
                         if use_segmentation:
-                            with tempfile.TemporaryDirectory() as td:
-                                temp_image_path = Path(td) / f"page_{i + 1}.jpg"
-                                temp_image_path.write_bytes(img_bytes)
-                                seg_result = segment_image_for_ocr(temp_image_path, vision_enabled=True)
-                                for region in seg_result.get("region_images", []):
-                                    region_img_bytes = io.BytesIO()
-                                    region["pil_image"].save(region_img_bytes, format="JPEG")
-                                    r = ocr.extract_text(
-                                        region_img_bytes.getvalue(), document_type, document_format
-                                    )
-                                    ocr_results.append(_normalize_ocr_result(r))
+                            from backend.utils.helper.image_segmentation import segment_image_for_ocr
+
+                            # segmentation works on pixels, so skip the encode/decode round trip
+                            encode = _as_pil_image
                         else:
-                            r = ocr.extract_text(img_bytes, document_type, document_format)
-                            ocr_results.append(_normalize_ocr_result(r))
+                            encode = ocr.encode_image if ocr.prefers_webp() else None
+                        pages = _iter_pdf_pages(file_bytes, pages_to_process, pdf_dpi, encode)
+                        for i, page in enumerate(pages):
+                            _emit_progress(
+                                progress_callback,
+                                20 + (i + 1) * 30 // pages_to_process,
+                                f"OCR on PDF page {i + 1}/{pages_to_process}",
+                            )
+                            if use_segmentation:
+                                seg_result = segment_image_for_ocr(page, vision_enabled=True)
+                                # regions are submitted in page order, so results stay grouped by page;
+                                # each region is encoded once, on the worker thread
+                                for region in seg_result.get("region_images", []):
+                                    _submit(ocr.extract_text_pil, region["pil_image"])
+                            else:
+                                _submit(ocr.extract_text_cached, page)
+
+                    # futures were appended in submission order, so results stay page-ordered
+                    for fut in futures:
+                        ocr_results.append(_normalize_ocr_result(fut.result()))
+                    if corrector is not None:
+                        speculative_pages = [c.result() for c in corrections if c is not None]
                     pages_processed = pages_to_process
             except Exception as e:
                 logger.error("PDF processing error: %s", e)
@@ -207,11 +332,14 @@ class DocumentProcessor:
 
         _emit_progress(progress_callback, 50, "Combining OCR results")
 
-        combined_raw_text = "\n".join([r.raw_text for r in ocr_results if getattr(r, "raw_text", None)])
         provider_used = ocr_results[0].provider_used if ocr_results else "unknown"
+        # results are normalized OCRResults, so .raw_text always exists; stripping each chunk
+        # leaves the joined text already stripped
+        combined_raw_text = "\n".join(r.raw_text.strip() for r in ocr_results if r.raw_text)
 
-        combined_ocr_result = OCRResult(
-            raw_text=(combined_raw_text or "").strip(),
+        # Built from already-validated page results, so construct without re-running validation
+        combined_ocr_result = OCRResult.model_construct(
+            raw_text=combined_raw_text,
             provider_used=provider_used,
             language_detected="auto_detected",
         )
@@ -220,20 +348,27 @@ class DocumentProcessor:
         corrected_text: Optional[str] = None
         if correction_provider != CorrectionProvider.NONE:
             _emit_progress(progress_callback, 70, "Applying AI correction")
-            logger.info("Creating correction provider: %s", correction_provider)
-            from backend.correction.correction_provider_factory import CorrectionProviderFactory
-
-            corrector = CorrectionProviderFactory.create_provider(correction_provider, **provider_kwargs)
+            corrector = _get_corrector()
             if corrector is None:
                 logger.warning("Failed to initialize correction provider (%s). Skipping correction.",
                                correction_provider)
             else:
-                corrected_text = corrector.correct_text(
-                    combined_ocr_result.raw_text or "",
-                    document_type,
-                    document_format,
-                    language,
-                )
+                raw_text = combined_ocr_result.raw_text or ""
+                if speculative_pages is not None:
+                    corrected_text = "\n\n".join(speculative_pages)
+                elif _overlaps_requests(corrector):
+                    # Providers that overlap or pack requests get paragraph-sized chunks: many short
+                    # decodes in parallel instead of one long one that may hit max_tokens
+                    chunks = split_paragraph_chunks(raw_text)
+                    corrected_text = "\n\n".join(
+                        corrector.correct_batch(chunks, document_type, document_format, language))
+                else:
+                    corrected_text = corrector.correct_text(
+                        raw_text,
+                        document_type,
+                        document_format,
+                        language,
+                    )
                 combined_ocr_result.corrected_text = corrected_text
 
         # Optional JSON parsing
@@ -243,7 +378,7 @@ class DocumentProcessor:
             base64_data_url = ""
             if file_type.startswith("image/"):
                 encoded_image = base64.b64encode(file_bytes).decode("utf-8")
-                base64_data_url = f"data:image/jpeg;base64,{encoded_image}"
+                base64_data_url = f"data:{image_mime_type(file_bytes)};base64,{encoded_image}"
 
             parsed = parse_corrected_markdown(correction_provider, base64_data_url, corrected_text)
             # parsed might be a Pydantic model, dataclass, or dict
@@ -275,7 +410,7 @@ class DocumentProcessor:
         if isinstance(ocr_result, OCRResultSchema):
             return ocr_result
         elif isinstance(ocr_result, StructuredOCRResultEnum):
-            return OCRResultSchema(
+            return OCRResultSchema.model_construct(
                 raw_text=ocr_result.raw_text,
                 corrected_text=ocr_result.corrected_text,
                 structured_data=ocr_result.structured_data,
@@ -1,29 +1,102 @@
+import asyncio
 import base64
 import io
-from pathlib import Path
-from typing import Dict, Any, List
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
-import fitz
-from PyPDF2 import PdfReader
 from fastapi import HTTPException
-from pdf2image import convert_from_bytes
 
 from backend.config import logger
 from backend.document_content.document_processor import DocumentProcessor
 from backend.document_content.pdf_content_formatter import PDFContentFormatter
 from backend.models.enums import OCRProvider, CorrectionProvider, DocumentType, DocumentFormat, Language
 from backend.models.schemas import OCRResult
+from backend.ocr.base import image_mime_type
 from backend.ocr.ocr_provider_factory import OCRProviderFactory
-from backend.utils.helper.image_segmentation import segment_image_for_ocr
 from backend.utils.ui_helpers import parse_corrected_markdown
 
+# Upper bound on OCR calls in flight at once, to stay inside provider rate limits
+_OCR_CONCURRENCY = 10
+# Page previews returned as image_data keep their historical 2x zoom, independent of the OCR render DPI
+_PREVIEW_DPI = 144
+
+
+async def _gather_ocr(calls: List[Tuple[Callable, tuple]]) -> List[Any]:
+    """Run blocking OCR calls on worker threads concurrently; results come back in call order."""
+    sem = asyncio.Semaphore(_OCR_CONCURRENCY)
+
+    async def _run(fn: Callable, args: tuple) -> Any:
+        async with sem:
+            return await asyncio.to_thread(fn, *args)
+
+    return await asyncio.gather(*(_run(fn, args) for fn, args in calls))
+
+
+_DIGIT_RUN_RE = re.compile(r"\d+")
+# One match per '.'-separated segment that is non-empty after strip()
+_SENTENCE_RE = re.compile(r"(?:^|\.)\s*[^.\s]")
+_OCR_CONFUSIONS = ("rn", "l1", "0O")
+_DATE_RE = re.compile(r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{4}-\d{2}-\d{2}')
+
+
+class _TextStats(NamedTuple):
+    dots: int
+    sentences: int
+    paragraph_breaks: int
+    sentence_breaks: int
+    digit_runs: int
+    has_ocr_confusion: bool
+    has_quote: bool
+    is_title: bool
+    has_upper: bool
+
+
+@lru_cache(maxsize=8)
+def _text_stats(text: str) -> _TextStats:
+    """
+    Every counter the improvement heuristics need, each from a single C-level scan (str.count,
+    precompiled regex), computed once per text and shared by both heuristics.
+    """
+    return _TextStats(
+        dots=text.count('.'),
+        sentences=len(_SENTENCE_RE.findall(text)),
+        paragraph_breaks=text.count('\n\n'),
+        sentence_breaks=text.count('. '),
+        digit_runs=len(_DIGIT_RUN_RE.findall(text)),
+        has_ocr_confusion=any(err in text for err in _OCR_CONFUSIONS),
+        has_quote='"' in text,
+        is_title=text.istitle(),
+        has_upper=text.lower() != text,
+    )
+
+
+def _render_and_ocr(ocr, file_bytes: bytes, page_number: int, dpi: int,
+                    document_type: DocumentType, document_format: DocumentFormat):
+    """
+    Rasterize a single page and OCR it. pdftoppm runs as its own process, so pages rendered from
+    different worker threads use separate cores, and only pages that need OCR are rendered.
+    """
+    from pdf2image import convert_from_bytes
+
+    image = convert_from_bytes(file_bytes, dpi=dpi, first_page=page_number, last_page=page_number)[0]
+    return ocr.extract_text_pil(image, document_type, document_format)
+
 
 class FastAPIDocumentProcessor(DocumentProcessor):
     """FastAPI-specific document processor with enhanced PDF handling for API usage"""
 
     @staticmethod
-    async def extract_pdf_content_advanced(file_bytes: bytes, max_pages: int = 5) -> Dict[str, Any]:
-        """Advanced PDF content extraction with multiple methods"""
+    async def extract_pdf_content_advanced(file_bytes: bytes, max_pages: int = 5, dpi: int = 144,
+                                           preview_dpi: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Advanced PDF content extraction with multiple methods.
+        Low-text pages are rendered at `dpi`; the JPEG bytes are kept under '_ocr_image_bytes' so OCR can
+        reuse them instead of rasterizing the page again. With `preview_dpi`, a separate preview JPEG is
+        kept under '_preview_image_bytes' (the OCR copy is reused when the resolutions match).
+        'image_data' is left empty: callers pop the raw bytes before returning and base64 the preview
+        into 'image_data' only if the response includes images.
+        """
         pdf_content = {
             'pages': [],
             'total_pages': 0,
@@ -33,6 +106,8 @@ class FastAPIDocumentProcessor(DocumentProcessor):
 
         try:
             # Try PyMuPDF first (better formatting)
+            import fitz  # PDF stack is loaded on the first PDF request, not at worker start-up
+
             pdf_doc = fitz.open(stream=file_bytes, filetype="pdf")
             pdf_content['total_pages'] = len(pdf_doc)
             pdf_content['metadata'] = pdf_doc.metadata
@@ -40,23 +115,29 @@ class FastAPIDocumentProcessor(DocumentProcessor):
             for page_num in range(min(len(pdf_doc), max_pages)):
                 page = pdf_doc[page_num]
 
-                # Extract text with formatting
-                text_dict = page.get_text("dict")
-                formatted_text = FastAPIDocumentProcessor._format_pymupdf_text(text_dict)
+                # Extract text with formatting; "blocks" yields plain block strings without the
+                # per-span font/bbox dicts that "dict" mode would build and throw away
+                formatted_text = FastAPIDocumentProcessor._format_pymupdf_blocks(page.get_text("blocks"))
 
                 # Get page image for OCR if text is insufficient
-                page_image = None
+                page_image = preview_image = None
                 if len(formatted_text.strip()) < 50:
-                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                    page_image = pix.tobytes("jpeg")
+                    pix = page.get_pixmap(dpi=dpi)
+                    page_image = pix.tobytes("jpeg", jpg_quality=75)
+                    if preview_dpi == dpi:
+                        preview_image = page_image
+                    elif preview_dpi:
+                        preview_image = page.get_pixmap(dpi=preview_dpi).tobytes("jpeg")
 
                 page_info = {
                     'page_number': page_num + 1,
                     'text': formatted_text,
                     'text_length': len(formatted_text),
                     'has_images': len(page.get_images()) > 0,
-                    'image_data': base64.b64encode(page_image).decode() if page_image else None,
-                    'needs_ocr': len(formatted_text.strip()) < 50
+                    'image_data': None,
+                    'needs_ocr': len(formatted_text.strip()) < 50,
+                    '_ocr_image_bytes': page_image,
+                    '_preview_image_bytes': preview_image,
                 }
 
                 pdf_content['pages'].append(page_info)
@@ -64,24 +145,22 @@ class FastAPIDocumentProcessor(DocumentProcessor):
             pdf_doc.close()
 
         except Exception as e:
-            logger.warning(f"PyMuPDF failed, falling back to PyPDF2: {e}")
+            logger.warning(f"PyMuPDF failed, falling back to PDFium/PyPDF2: {e}")
             return FastAPIDocumentProcessor._extract_with_pypdf2(file_bytes, max_pages)
 
         return pdf_content
 
     @staticmethod
-    def _format_pymupdf_text(text_dict: Dict) -> str:
-        """Format PyMuPDF text dictionary into readable text"""
+    def _format_pymupdf_blocks(blocks: List[tuple]) -> str:
+        """
+        Format PyMuPDF "blocks" output into readable text: each text block (block_type 0) becomes
+        one paragraph with its non-empty lines joined by spaces.
+        """
         formatted_lines = []
 
-        for block in text_dict.get('blocks', []):
-            if 'lines' in block:
-                block_lines = []
-                for line in block['lines']:
-                    line_text = "".join(span['text'] for span in line['spans'])
-                    if line_text.strip():
-                        block_lines.append(line_text.strip())
-
+        for _x0, _y0, _x1, _y1, block_text, _block_no, block_type in blocks:
+            if block_type == 0:
+                block_lines = [line.strip() for line in block_text.split('\n') if line.strip()]
                 if block_lines:
                     formatted_lines.append(' '.join(block_lines))
 
@@ -89,7 +168,22 @@ class FastAPIDocumentProcessor(DocumentProcessor):
 
     @staticmethod
     def _extract_with_pypdf2(file_bytes: bytes, max_pages: int) -> Dict[str, Any]:
-        """Fallback PDF extraction with PyPDF2"""
+        """
+        Fallback PDF extraction for files PyMuPDF could not handle, so it uses a different parser:
+        PDFium (native) when pypdfium2 is installed, PyPDF2 otherwise. Both are imported only here.
+        """
+        try:
+            import pypdfium2
+        except ImportError:
+            pypdfium2 = None
+        if pypdfium2 is not None:
+            try:
+                return FastAPIDocumentProcessor._extract_with_pdfium(pypdfium2, file_bytes, max_pages)
+            except Exception as e:
+                logger.warning(f"PDFium extraction failed, falling back to PyPDF2: {e}")
+
+        from PyPDF2 import PdfReader
+
         pdf_content = {
             'pages': [],
             'total_pages': 0,
@@ -122,6 +216,37 @@ class FastAPIDocumentProcessor(DocumentProcessor):
             raise HTTPException(status_code=500, detail=f"PDF extraction failed: {str(e)}")
         return pdf_content
 
+    @staticmethod
+    def _extract_with_pdfium(pdfium, file_bytes: bytes, max_pages: int) -> Dict[str, Any]:
+        """Text extraction with PDFium's native text layer; same page_info shape as the PyPDF2 path"""
+        pdf_content = {
+            'pages': [],
+            'total_pages': 0,
+            'extraction_method': 'pdfium',
+            'metadata': {}
+        }
+
+        pdf = pdfium.PdfDocument(file_bytes)
+        try:
+            pdf_content['total_pages'] = len(pdf)
+            pdf_content['metadata'] = pdf.get_metadata_dict()
+
+            for page_num in range(min(len(pdf), max_pages)):
+                # PDFium ends lines with CRLF; normalize so paragraph splitting on blank lines works
+                text = pdf[page_num].get_textpage().get_text_range().replace('\r\n', '\n')
+
+                page_info = {
+                    'page_number': page_num + 1,
+                    'text': PDFContentFormatter.format_text_blocks(text),
+                    'text_length': len(text),
+                    'needs_ocr': len(text.strip()) < 50
+                }
+
+                pdf_content['pages'].append(page_info)
+        finally:
+            pdf.close()
+        return pdf_content
+
     @staticmethod
     async def process_document_enhanced(
             file_bytes: bytes,
@@ -136,6 +261,7 @@ class FastAPIDocumentProcessor(DocumentProcessor):
             max_pdf_pages: int = 5,
             pdf_dpi: int = 300,
             custom_prompt=None,
+            include_page_images: bool = True,
             **provider_kwargs,
     ) -> Dict[str, Any]:
         """Process document and return results for FastAPI"""
@@ -148,27 +274,28 @@ class FastAPIDocumentProcessor(DocumentProcessor):
             if file_type.startswith("image/"):
                 logger.info("Processing image...")
                 if use_segmentation:
-                    temp_image_path = Path("temp_image.jpg")
-                    with open(temp_image_path, "wb") as f:
-                        f.write(file_bytes)
-                    seg_result = segment_image_for_ocr(temp_image_path, vision_enabled=True)
-                    temp_image_path.unlink()
-
-                    for region in seg_result.get('region_images', []):
-                        img_bytes = io.BytesIO()
-                        region['pil_image'].save(img_bytes, format="JPEG")
-                        ocr_result = ocr.extract_text(img_bytes.getvalue(), DocumentType.GENERAL, document_format,
-                                                      custom_prompt)
-                        ocr_result = DocumentProcessor._normalize_ocr_result(ocr_result)
-                        ocr_results.append(ocr_result)
+                    from backend.utils.helper.image_segmentation import segment_image_for_ocr_bytes
+
+                    seg_result = segment_image_for_ocr_bytes(file_bytes, vision_enabled=True)
+
+                    # extract_text_pil encodes on the worker thread, overlapping with other regions' requests
+                    region_results = await _gather_ocr([
+                        (ocr.extract_text_pil, (region['pil_image'], DocumentType.GENERAL, document_format,
+                                                custom_prompt))
+                        for region in seg_result.get('region_images', [])
+                    ])
+                    for ocr_result in region_results:
+                        ocr_results.append(DocumentProcessor._normalize_ocr_result(ocr_result))
                 else:
-                    ocr_result = ocr.extract_text(file_bytes, document_type, document_format)
+                    ocr_result = ocr.extract_text_cached(file_bytes, document_type, document_format)
                     ocr_result = DocumentProcessor._normalize_ocr_result(ocr_result)
                     ocr_results.append(ocr_result)
 
             elif file_type == "application/pdf":
                 logger.info("Processing PDF with enhanced extraction...")
-                pdf_content = await FastAPIDocumentProcessor.extract_pdf_content_advanced(file_bytes, max_pdf_pages)
+                pdf_content = await FastAPIDocumentProcessor.extract_pdf_content_advanced(
+                    file_bytes, max_pdf_pages, dpi=pdf_dpi,
+                    preview_dpi=_PREVIEW_DPI if include_page_images else None)
                 combined_text = ""
                 pages_needing_ocr = []
 
@@ -180,7 +307,7 @@ class FastAPIDocumentProcessor(DocumentProcessor):
 
                 # Create OCR result from extracted text
                 if combined_text.strip():
-                    text_ocr_result = OCRResult(
+                    text_ocr_result = OCRResult.model_construct(
                         raw_text=combined_text.strip(),
                         provider_used=f"text_extraction_{pdf_content['extraction_method']}",
                         language_detected="auto_detected",
@@ -191,23 +318,31 @@ class FastAPIDocumentProcessor(DocumentProcessor):
                 # Process pages that need OCR
                 if pages_needing_ocr:
                     logger.info(f"Running OCR on {len(pages_needing_ocr)} pages...")
-                    images = convert_from_bytes(file_bytes, dpi=pdf_dpi)
-
-                    for page_info in pages_needing_ocr:
-                        page_idx = page_info['page_number'] - 1
-                        if page_idx < len(images):
-                            img_byte_arr = io.BytesIO()
-                            images[page_idx].save(img_byte_arr, format="JPEG")
-                            img_bytes = img_byte_arr.getvalue()
-
-                            page_ocr_result = ocr.extract_text(img_bytes, document_type, document_format)
-                            page_ocr_result = DocumentProcessor._normalize_ocr_result(page_ocr_result)
-
-                            # Add page information to the result
-                            if hasattr(page_ocr_result, 'raw_text'):
-                                page_ocr_result.raw_text = f"--- Page {page_info['page_number']} (OCR) ---\n{page_ocr_result.raw_text}"
-                                page_ocr_result.structured_data = {}
-                            ocr_results.append(page_ocr_result)
+                    # Pages PyMuPDF already rendered go straight to OCR; only the rest hit poppler
+                    page_results = await _gather_ocr([
+                        (ocr.extract_text_cached, (page_info['_ocr_image_bytes'], document_type, document_format))
+                        if page_info.get('_ocr_image_bytes') else
+                        (_render_and_ocr, (ocr, file_bytes, page_info['page_number'], pdf_dpi, document_type,
+                                           document_format))
+                        for page_info in pages_needing_ocr
+                    ])
+
+                    for page_info, page_ocr_result in zip(pages_needing_ocr, page_results):
+                        page_ocr_result = DocumentProcessor._normalize_ocr_result(page_ocr_result)
+
+                        # Add page information to the result
+                        if hasattr(page_ocr_result, 'raw_text'):
+                            page_ocr_result.raw_text = f"--- Page {page_info['page_number']} (OCR) ---\n{page_ocr_result.raw_text}"
+                            page_ocr_result.structured_data = {}
+                        ocr_results.append(page_ocr_result)
+
+            if pdf_content:
+                for page_info in pdf_content['pages']:
+                    page_info.pop('_ocr_image_bytes', None)
+                    preview_image = page_info.pop('_preview_image_bytes', None)
+                    # base64 only what the response actually carries
+                    if include_page_images and preview_image:
+                        page_info['image_data'] = base64.b64encode(preview_image).decode()
 
             logger.info("Combining results...")
             combined_raw_text = "\n\n".join(result.raw_text for result in ocr_results if result.raw_text)
@@ -257,7 +392,7 @@ class FastAPIDocumentProcessor(DocumentProcessor):
                     base64_data_url = ""
                     if file_type.startswith("image/"):
                         encoded_image = base64.b64encode(file_bytes).decode()
-                        base64_data_url = f"data:image/jpeg;base64,{encoded_image}"
+                        base64_data_url = f"data:{image_mime_type(file_bytes)};base64,{encoded_image}"
                     try:
                         structured_json = parse_corrected_markdown(correction_provider, base64_data_url, corrected_text)
                         if structured_json:
@@ -286,22 +421,18 @@ class FastAPIDocumentProcessor(DocumentProcessor):
     def _calculate_improvement_score(raw_text: str, corrected_text: str) -> int:
         """Calculate a simple improvement score based on text quality indicators"""
         score = 50  # Base score
-
-        # Check for improvements
-        raw_sentences = len([s for s in raw_text.split('.') if s.strip()])
-        corrected_sentences = len([s for s in corrected_text.split('.') if s.strip()])
+        raw, corrected = _text_stats(raw_text), _text_stats(corrected_text)
 
         # Better sentence structure
-        if corrected_sentences > raw_sentences:
+        if corrected.sentences > raw.sentences:
             score += 10
 
         # Check for common OCR error corrections
-        ocr_errors = ['rn' in raw_text, 'l1' in raw_text, '0O' in raw_text]
-        if any(ocr_errors) and not any(error in corrected_text for error in ['rn', 'l1', '0O']):
+        if raw.has_ocr_confusion and not corrected.has_ocr_confusion:
             score += 15
 
         # Check for proper capitalization
-        if corrected_text.count('. ') > raw_text.count('. '):
+        if corrected.sentence_breaks > raw.sentence_breaks:
             score += 10
 
         # Length improvement (within reason)
@@ -315,26 +446,24 @@ class FastAPIDocumentProcessor(DocumentProcessor):
     def _identify_improvements(raw_text: str, corrected_text: str) -> List[str]:
         """Identify specific improvements made during correction"""
         improvements = []
+        raw, corrected = _text_stats(raw_text), _text_stats(corrected_text)
 
         # Check for common improvements
-        if len(corrected_text.split('.')) > len(raw_text.split('.')):
+        if corrected.dots > raw.dots:
             improvements.append("Improved sentence structure and punctuation")
 
-        if corrected_text.count('\n\n') > raw_text.count('\n\n'):
+        if corrected.paragraph_breaks > raw.paragraph_breaks:
             improvements.append("Better paragraph organization")
 
-        if corrected_text.istitle() != raw_text.istitle() and any(c.isupper() for c in corrected_text):
+        if corrected.is_title != raw.is_title and corrected.has_upper:
             improvements.append("Fixed capitalization and proper nouns")
 
         # Check for number formatting
-        import re
-        raw_numbers = len(re.findall(r'\d+', raw_text))
-        corrected_numbers = len(re.findall(r'\d+', corrected_text))
-        if corrected_numbers >= raw_numbers:
+        if corrected.digit_runs >= raw.digit_runs:
             improvements.append("Preserved/corrected numerical data")
 
         # Check for special characters
-        if '"' in corrected_text and '"' not in raw_text:
+        if corrected.has_quote and not raw.has_quote:
             improvements.append("Added proper quotation marks")
 
         if not improvements:
@@ -344,16 +473,20 @@ class FastAPIDocumentProcessor(DocumentProcessor):
 
     @staticmethod
     def _get_json_depth(obj, depth=0):
-        """Get the maximum depth of a JSON object"""
-        if depth > 10:  # Prevent infinite recursion
-            return depth
-
-        if isinstance(obj, dict):
-            return max([FastAPIDocumentProcessor._get_json_depth(v, depth + 1) for v in obj.values()] + [depth])
-        elif isinstance(obj, list):
-            return max([FastAPIDocumentProcessor._get_json_depth(item, depth + 1) for item in obj] + [depth])
-        else:
-            return depth
+        """Get the maximum depth of a JSON object (explicit stack, no per-level lists or frames)"""
+        max_depth = depth
+        stack = [(obj, depth)]
+        while stack:
+            node, level = stack.pop()
+            if level > max_depth:
+                max_depth = level
+            if level > 10:  # Don't descend past this depth
+                continue
+            if isinstance(node, dict):
+                stack.extend((v, level + 1) for v in node.values())
+            elif isinstance(node, list):
+                stack.extend((item, level + 1) for item in node)
+        return max_depth
 
     @staticmethod
     def _summarize_json_fields(json_obj: dict, prefix="") -> Dict[str, List[str]]:
@@ -366,26 +499,31 @@ class FastAPIDocumentProcessor(DocumentProcessor):
             "Object Fields": []
         }
 
-        for key, value in json_obj.items():
-            full_key = f"{prefix}.{key}" if prefix else key
-
-            if isinstance(value, str):
-                # Check if it's a date
-                import re
-                if re.search(r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}', value) or re.search(r'\d{4}-\d{2}-\d{2}', value):
-                    summary["Date Fields"].append(full_key)
-                else:
-                    summary["Text Fields"].append(full_key)
-            elif isinstance(value, (int, float)):
-                summary["Number Fields"].append(full_key)
-            elif isinstance(value, list):
-                summary["List Fields"].append(f"{full_key} ({len(value)} items)")
-            elif isinstance(value, dict):
-                summary["Object Fields"].append(full_key)
-                # Recursively process nested objects (limit depth)
-                if len(prefix.split('.')) < 2:
-                    nested_summary = FastAPIDocumentProcessor._summarize_json_fields(value, full_key)
-                    for field_type, fields in nested_summary.items():
-                        summary[field_type].extend(fields)
+        # Walk nested objects with an explicit stack of item iterators: fields are appended straight
+        # into `summary` in the same depth-first order recursion would give, without merging sub-summaries
+        stack = [(iter(json_obj.items()), prefix)]
+        while stack:
+            items, prefix = stack[-1]
+            for key, value in items:
+                full_key = f"{prefix}.{key}" if prefix else key
+
+                if isinstance(value, str):
+                    # Check if it's a date
+                    if _DATE_RE.search(value):
+                        summary["Date Fields"].append(full_key)
+                    else:
+                        summary["Text Fields"].append(full_key)
+                elif isinstance(value, (int, float)):
+                    summary["Number Fields"].append(full_key)
+                elif isinstance(value, list):
+                    summary["List Fields"].append(f"{full_key} ({len(value)} items)")
+                elif isinstance(value, dict):
+                    summary["Object Fields"].append(full_key)
+                    # Descend into nested objects (limit depth), resuming this level afterwards
+                    if '.' not in prefix:
+                        stack.append((iter(value.items()), full_key))
+                        break
+            else:
+                stack.pop()
 
         return summary
@@ -2,9 +2,13 @@ import logging
 import re
 from typing import Dict, Any
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_WS_RE = re.compile(r'\s+')
+_FORM_KEYWORDS = ('name:', 'date:', 'address:', 'phone:')
+_INVOICE_KEYWORDS = ('total:', 'amount:', 'price:', '$', 'rs.')
+_CERTIFICATE_KEYWORDS = ('certificate', 'diploma', 'degree')
+
 
 class PDFContentFormatter:
     """Enhanced PDF document_content formatter for better display"""
@@ -15,17 +19,9 @@ class PDFContentFormatter:
         if not text.strip():
             return text
 
-        # Split into paragraphs and clean up
-        paragraphs = text.split('\n\n')
-        formatted_paragraphs = []
-
-        for para in paragraphs:
-            # Clean up excessive whitespace
-            para = re.sub(r'\s+', ' ', para.strip())
-            if para:  # Only add non-empty paragraphs
-                formatted_paragraphs.append(para)
-
-        return '\n\n'.join(formatted_paragraphs)
+        # Split into paragraphs, drop empty ones and collapse excessive whitespace
+        paragraphs = (para.strip() for para in text.split('\n\n'))
+        return '\n\n'.join(_WS_RE.sub(' ', para) for para in paragraphs if para)
 
     @staticmethod
     def extract_metadata_from_text(text: str) -> Dict[str, Any]:
@@ -38,11 +34,12 @@ class PDFContentFormatter:
         }
 
         # Try to detect document structure
-        if any(keyword in text.lower() for keyword in ['name:', 'date:', 'address:', 'phone:']):
+        text_lower = text.lower()
+        if any(keyword in text_lower for keyword in _FORM_KEYWORDS):
             metadata['likely_form'] = True
-        if any(keyword in text.lower() for keyword in ['total:', 'amount:', 'price:', '$', 'rs.']):
+        if any(keyword in text_lower for keyword in _INVOICE_KEYWORDS):
             metadata['likely_invoice'] = True
-        if any(keyword in text.lower() for keyword in ['certificate', 'diploma', 'degree']):
+        if any(keyword in text_lower for keyword in _CERTIFICATE_KEYWORDS):
             metadata['likely_certificate'] = True
 
         return metadata
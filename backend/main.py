@@ -1,12 +1,57 @@
+import asyncio
+import contextlib
+import logging
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from backend.app.api.v1.endpoints.models import warm_model_cache
+from backend.app.api.v1.endpoints.ocr_premium import close_http_client
 from backend.app.api.v1.router import api_router
+from backend.config import logger
+from backend.correction.ollama_corrector import close_ollama_client
+from backend.correction.vllm_corrector import close_vllm_clients
 from backend.core.config import settings
 
-app = FastAPI(title=settings.APP_NAME, version="1.0.0")
+# Root logging is configured once here rather than by each module at import time
+logging.basicConfig(level=logging.INFO)
+
+# refresh model listings before the 180s cache TTL runs out
+MODEL_CACHE_REFRESH_S = 150
+
+
+async def _refresh_model_cache():
+    # The first warm-up runs here too, so a slow or unreachable provider never holds up startup
+    while True:
+        try:
+            await warm_model_cache()
+        except Exception as e:
+            logger.warning(f"Model cache refresh failed: {e}")
+        await asyncio.sleep(MODEL_CACHE_REFRESH_S)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    refresher = asyncio.create_task(_refresh_model_cache())
+    yield
+    refresher.cancel()
+    # let an in-flight warm-up unwind before the clients it may be using are closed
+    with contextlib.suppress(asyncio.CancelledError):
+        await refresher
+    await close_http_client()
+    await close_ollama_client()
+    await close_vllm_clients()
+
+
+app = FastAPI(
+    title=settings.APP_NAME,
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS
 app.add_middleware(
@@ -21,9 +66,12 @@ app.add_middleware(
 # Response time header
 @app.middleware("http")
 async def add_timing(request: Request, call_next):
-    start = time.time()
+    start = time.perf_counter_ns()
     resp = await call_next(request)
-    resp.headers["X-Response-Time-ms"] = f"{(time.time() - start) * 1000:.2f}"
+    # Integer math keeps the 2-decimal ms value without float formatting; appending to raw_headers
+    # skips MutableHeaders' per-assignment normalization (the name is already lowercase bytes)
+    elapsed_10us = (time.perf_counter_ns() - start) // 10_000
+    resp.raw_headers.append((b"x-response-time-ms", b"%d.%02d" % divmod(elapsed_10us, 100)))
     return resp
 
 
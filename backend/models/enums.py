@@ -1,9 +1,10 @@
-from enum import Enum
+from enum import Enum, unique
 from typing import Optional, Dict, Any
 
 from pydantic import BaseModel
 
 
+@unique
 class DocumentType(str, Enum):
     GENERAL = "GENERAL"
     GOVERNMENT_DOCUMENT = "GOVERNMENT_DOCUMENT"
@@ -26,6 +27,7 @@ class DocumentType(str, Enum):
     OTHER = "OTHER"
 
 
+@unique
 class DocumentFormat(str, Enum):
     HANDWRITTEN = "HANDWRITTEN"
     PRINTED = "PRINTED"
@@ -33,12 +35,14 @@ class DocumentFormat(str, Enum):
     PLASTIC_COVER = "PLASTIC_COVER"
 
 
+@unique
 class Language(str, Enum):
     NEPALI = "NEPALI"
     ENGLISH = "ENGLISH"
     AUTO_DETECT = "AUTO_DETECT"
 
 
+@unique
 class OCRProvider(str, Enum):
     GEMINI = "GEMINI"
     MISTRAL = "MISTRAL"
@@ -48,6 +52,7 @@ class OCRProvider(str, Enum):
     NONE = "NONE"
 
 
+@unique
 class CorrectionProvider(str, Enum):
     GEMINI = "GEMINI"
     MISTRAL = "MISTRAL"
@@ -1,13 +1,49 @@
-from typing import Optional
+import hashlib
+import io
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
+
+try:
+    import numpy as np
+    import simplejpeg  # libjpeg-turbo bindings; encodes straight from the pixel buffer
+except ImportError:
+    simplejpeg = None
 
 from backend.models.enums import DocumentFormat, DocumentType, StructuredOCRResult
 from backend.models.mappings import DOCUMENT_FIELD_MAP
 from backend.ocr.prompt import create_extraction_prompt
+from backend.utils.cache import LRUCache
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# WebP's hard limit on either side; larger images are sent as JPEG
+_WEBP_MAX_DIM = 16383
+
+
+@lru_cache(maxsize=1)
+def _webp_supported() -> bool:
+    from PIL import features
+    return bool(features.check("webp"))
+
+
+def image_mime_type(data: bytes) -> str:
+    """MIME type of encoded image bytes, sniffed from the magic number (JPEG when unrecognised)."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    return "image/jpeg"
 
 
 class BaseOCRProvider:
+    # Providers whose backend cannot decode WebP uploads set this to False and get JPEG
+    accepts_webp = True
+
     def __init__(self, api_key: str):
         self.api_key = api_key
+        # Results keyed by image content hash; instances are shared across requests by the factory
+        self._result_cache = LRUCache(maxsize=512)
         self.configure()
 
     def configure(self):
@@ -17,6 +53,63 @@ class BaseOCRProvider:
                      document_format: DocumentFormat, custom_prompt: Optional[str] = None) -> StructuredOCRResult:
         raise NotImplementedError
 
+    def extract_text_batch(self, images: List[bytes], document_type: DocumentType,
+                           document_format: DocumentFormat,
+                           custom_prompt: Optional[str] = None) -> List[StructuredOCRResult]:
+        """OCR several images, results in input order; providers that can overlap requests override this."""
+        return [self.extract_text(image, document_type, document_format, custom_prompt) for image in images]
+
+    def extract_text_cached(self, image_data: bytes, document_type: DocumentType,
+                            document_format: DocumentFormat, custom_prompt: Optional[str] = None) -> StructuredOCRResult:
+        """
+        extract_text memoized on a hash of the image bytes, so identical pages or regions (re-uploads,
+        repeated letterheads) skip the provider call. Only results that pass _is_cacheable are stored,
+        so a failed attempt is retried next time. Returns a copy the caller may modify.
+        """
+        key = (hashlib.blake2b(image_data, digest_size=16).digest(), document_type, document_format, custom_prompt)
+        result = self._result_cache.get(key)
+        if result is None:
+            result = self.extract_text(image_data, document_type, document_format, custom_prompt)
+            if self._is_cacheable(result):
+                self._result_cache.set(key, result)
+        return result.model_copy()
+
+    @staticmethod
+    def _is_cacheable(result: StructuredOCRResult) -> bool:
+        """
+        Providers report failures by raising; an empty transcription is treated as a failure too.
+        Providers that return error text in a result instead override this to reject it.
+        """
+        return bool((getattr(result, "raw_text", None) or "").strip())
+
+    def prefers_webp(self) -> bool:
+        return self.accepts_webp and _webp_supported()
+
+    def encode_image(self, image: "Image.Image") -> bytes:
+        """
+        Encode a PIL image for upload: WebP (q80) where the provider accepts it, which is markedly
+        smaller than JPEG at the same legibility and so shrinks the base64 request body; JPEG otherwise.
+        """
+        buf = io.BytesIO()
+        if self.prefers_webp() and max(image.size) <= _WEBP_MAX_DIM:
+            image.save(buf, format="WEBP", quality=80, method=4)
+            return buf.getvalue()
+        if simplejpeg is not None and image.mode == "RGB":
+            try:
+                return simplejpeg.encode_jpeg(np.asarray(image), quality=75, colorspace="RGB", fastdct=True)
+            except Exception:
+                pass  # fall back to PIL's encoder
+        image.save(buf, format="JPEG")
+        return buf.getvalue()
+
+    def extract_text_pil(self, image: "Image.Image", document_type: DocumentType,
+                         document_format: DocumentFormat, custom_prompt: Optional[str] = None) -> StructuredOCRResult:
+        """
+        OCR an in-memory PIL image. Every provider here is a remote multimodal API that needs encoded
+        bytes, so the image is encoded exactly once, on the calling (worker) thread.
+        """
+        return self.extract_text_cached(self.encode_image(image), document_type, document_format, custom_prompt)
+
     @staticmethod
     def _create_extraction_prompt(document_type: DocumentType,
                                   document_format: DocumentFormat, custom_prompt: Optional[str] = None) -> str:
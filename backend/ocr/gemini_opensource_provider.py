@@ -14,7 +14,7 @@ from backend.config import logger
 from backend.models.enums import DocumentType, DocumentFormat
 from backend.models.mappings import DOCUMENT_FIELD_MAP
 from backend.models.schemas import OCRResult
-from backend.ocr.base import BaseOCRProvider
+from backend.ocr.base import BaseOCRProvider, image_mime_type
 
 
 class GeminiOpensourceOCRProvider(BaseOCRProvider):
@@ -25,11 +25,9 @@ class GeminiOpensourceOCRProvider(BaseOCRProvider):
         self.__gemini_model = model
         self.available_models = []
         self.client = None
-        # Call parent initializer
+        # Call parent initializer (runs configure once)
         super().__init__(api_key=api_key)
         logger.debug(f"Initialized GeminiOpensourceOCRProvider with model: {self.__gemini_model}")
-        # Configure after parent initialization to ensure attributes are preserved
-        self.configure()
 
     def configure(self):
         """Configure the Gemini connection and select an appropriate model"""
@@ -87,7 +85,7 @@ class GeminiOpensourceOCRProvider(BaseOCRProvider):
                 {
                     "inline_data": {
                         "data": encoded_image,
-                        "mime_type": "image/jpeg"
+                        "mime_type": image_mime_type(image_data)
                     }
                 }
             ]
@@ -8,7 +8,7 @@ from backend.config import logger
 from backend.models.enums import DocumentType, DocumentFormat
 from backend.models.mappings import DOCUMENT_FIELD_MAP
 from backend.models.schemas import OCRResult
-from backend.ocr.base import BaseOCRProvider
+from backend.ocr.base import BaseOCRProvider, image_mime_type
 
 
 class GeminiOCRProvider(BaseOCRProvider):
@@ -21,7 +21,6 @@ class GeminiOCRProvider(BaseOCRProvider):
         self.client = None
         super().__init__(api_key=api_key)
         logger.debug(f"Initialized GeminiOCRProvider with model: {self.__gemini_model}")
-        self.configure()
 
     def configure(self):
         """Configure the Gemini connection and select an appropriate model"""
@@ -92,7 +91,7 @@ class GeminiOCRProvider(BaseOCRProvider):
                 {
                     "inline_data": {
                         "data": encoded_image,
-                        "mime_type": "image/jpeg"
+                        "mime_type": image_mime_type(image_data)
                     }
                 }
             ]
@@ -13,7 +13,7 @@ from backend.config import logger
 from backend.models.enums import DocumentType, DocumentFormat
 from backend.models.mappings import DOCUMENT_FIELD_MAP
 from backend.models.schemas import OCRResult
-from backend.ocr.base import BaseOCRProvider
+from backend.ocr.base import BaseOCRProvider, image_mime_type
 
 
 class MistralOCRProvider(BaseOCRProvider):
@@ -23,6 +23,9 @@ class MistralOCRProvider(BaseOCRProvider):
     - If a prompt is desired, runs a second-pass chat completion to transform/extract.
     """
 
+    # The OCR endpoint documents JPEG/PNG/AVIF image input, not WebP
+    accepts_webp = False
+
     def __init__(
             self,
             api_key: str,
@@ -34,7 +37,6 @@ class MistralOCRProvider(BaseOCRProvider):
         self.available_models = [model]
         self.client: Optional[Mistral] = None
         super().__init__(api_key=api_key)
-        self.configure()
 
     def configure(self):
         """Configure the Mistral client."""
@@ -64,7 +66,7 @@ class MistralOCRProvider(BaseOCRProvider):
 
             # 1) OCR (high-fidelity transcription)
             encoded_image = base64.b64encode(image_data).decode("utf-8")
-            base64_data_url = f"data:image/jpeg;base64,{encoded_image}"
+            base64_data_url = f"data:{image_mime_type(image_data)};base64,{encoded_image}"
 
             ocr_resp = self.client.ocr.process(
                 document=ImageURLChunk(image_url=base64_data_url),
@@ -8,6 +8,18 @@ import json
 from typing import List, Dict, Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
 
 from backend.config import logger
 from backend.core.config import settings
@@ -16,27 +28,37 @@ from backend.models.mappings import DOCUMENT_FIELD_MAP
 from backend.models.schemas import OCRResult
 from backend.ocr.base import BaseOCRProvider
 
+# Enough keep-alive connections for the processors' concurrent page/region OCR
+_POOL_SIZE = 16
+
 
 class OllamaOCRProvider(BaseOCRProvider):
     """Ollama provider for OCR using Gemma3 models with structured JSON extraction"""
 
+    # Ollama's image loader does not reliably decode WebP
+    accepts_webp = False
+
     def __init__(self, api_key: str, endpoint: str = settings.OLLAMA_API, model: str = "gemma3:4b"):
         # Store endpoint and model in unique attributes to avoid parent class conflicts
         self.__endpoint = endpoint.rstrip('/')
         self.__ollama_model = model
         self.available_models = []
-        # Call parent initializer
+        # The factory shares this instance across requests, so its pooled session keeps
+        # connections to Ollama alive instead of reconnecting on every call
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Call parent initializer (runs configure once)
         super().__init__(api_key=api_key)
         logger.debug(f"Initialized OllamaOCRProvider with model: {self.__ollama_model} at endpoint: {self.__endpoint}")
-        # Configure after parent initialization to ensure attributes are preserved
-        self.configure()
 
     def configure(self):
         """Configure the Ollama connection and select an appropriate model"""
         try:
             logger.debug(f"Configuring with model: {self.__ollama_model}")
             # Test connection to Ollama
-            response = requests.get(f"{self.__endpoint}/api/tags", timeout=10)
+            response = self._session.get(f"{self.__endpoint}/api/tags", timeout=10)
             if response.status_code == 200:
                 self.available_models = [model["name"] for model in response.json().get("models", [])]
                 logger.info(f"Available Ollama models: {self.available_models}")
@@ -91,14 +113,15 @@ class OllamaOCRProvider(BaseOCRProvider):
             }
 
             # Make request to Ollama
-            response = requests.post(
+            response = self._session.post(
                 f"{self.__endpoint}/api/generate",
-                json=payload,
+                data=_json_dumps(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=120  # OCR can take time
             )
 
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 raw_text = result.get("response", "")
 
                 # For structured document types, attempt to parse and validate JSON
@@ -154,7 +177,7 @@ class OllamaOCRProvider(BaseOCRProvider):
         """Pull/download a model to Ollama"""
         try:
             payload = {"name": model_name}
-            response = requests.post(
+            response = self._session.post(
                 f"{self.__endpoint}/api/pull",
                 json=payload,
                 timeout=600  # Model download can take time
@@ -167,7 +190,7 @@ class OllamaOCRProvider(BaseOCRProvider):
     def list_available_models(self) -> List[str]:
         """List all available models in Ollama"""
         try:
-            response = requests.get(f"{self.__endpoint}/api/tags", timeout=10)
+            response = self._session.get(f"{self.__endpoint}/api/tags", timeout=10)
             if response.status_code == 200:
                 return [model["name"] for model in response.json().get("models", [])]
             return []
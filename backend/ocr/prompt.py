@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import Optional, Sequence
 
 from backend.models.enums import DocumentFormat, DocumentType
 from backend.models.mappings import DOCUMENT_FIELD_MAP
 
 
-def _fields_list_for(document_type: DocumentType) -> List[str]:
-    return DOCUMENT_FIELD_MAP.get(document_type, [])
+def _fields_list_for(document_type: DocumentType) -> Sequence[str]:
+    return DOCUMENT_FIELD_MAP.get(document_type, ())
 
 
-def _json_envelope_intro(document_type: DocumentType, fields_list: List[str]) -> str:
+def _json_envelope_intro(document_type: DocumentType, fields_list: Sequence[str]) -> str:
     fields_csv = ", ".join(fields_list)
     return f"""You are an expert OCR system. Extract data from this {document_type.value} image.
 
@@ -75,7 +75,7 @@ def _generic_fallback(document_type: DocumentType, document_format: DocumentForm
     )
 
 
-def prompt_ctzn_front(fields: List[str]) -> str:
+def prompt_ctzn_front(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.CTZN_FRONT, fields) + _extras_rule() + """
     Document-specific rules:
     - Extract ONLY in Nepali (Devanagari) as printed.
@@ -88,7 +88,7 @@ def prompt_ctzn_front(fields: List[str]) -> str:
     """
 
 
-def prompt_ctzn_back(fields: List[str]) -> str:
+def prompt_ctzn_back(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.CTZN_BACK, fields) + _extras_rule() + """
     Document-specific rules:
     - "issue_date": strictly from "जारी मिति:"; keep Nepali digits and separators as printed.
@@ -99,7 +99,7 @@ def prompt_ctzn_back(fields: List[str]) -> str:
     """
 
 
-def prompt_voter_id(fields: List[str]) -> str:
+def prompt_voter_id(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.VOTER_ID, fields) + _extras_rule() + """
     Document-specific rules:
     - Extract ONLY in Nepali script.
@@ -112,7 +112,7 @@ def prompt_voter_id(fields: List[str]) -> str:
     """
 
 
-def prompt_license(fields: List[str]) -> str:
+def prompt_license(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.LICENSE, fields) + _extras_rule() + """
     Document-specific rules:
     - "blood_group": extract as printed (e.g., "B+" or label variants).
@@ -125,7 +125,7 @@ def prompt_license(fields: List[str]) -> str:
     """
 
 
-def prompt_passport_front(fields: List[str]) -> str:
+def prompt_passport_front(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.PASSPORT_FRONT, fields) + _extras_rule() + """
     Document-specific rules:
     - "full_name": combine "GIVEN NAMES" + "SURNAME" (exact casing/spaces).
@@ -136,7 +136,7 @@ def prompt_passport_front(fields: List[str]) -> str:
     """
 
 
-def prompt_passport_back(fields: List[str]) -> str:
+def prompt_passport_back(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.PASSPORT_BACK, fields) + _extras_rule() + """
     Document-specific rules:
     - "old_passport_number": extract as printed if present.
@@ -148,7 +148,7 @@ def prompt_passport_back(fields: List[str]) -> str:
     """
 
 
-def prompt_national_id_front(fields: List[str]) -> str:
+def prompt_national_id_front(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.NATIONAL_ID_FRONT, fields) + _extras_rule() + r"""
     Document-specific rules:
     - "nationality": as printed.
@@ -161,7 +161,7 @@ def prompt_national_id_front(fields: List[str]) -> str:
     """
 
 
-def prompt_national_id_back(fields: List[str]) -> str:
+def prompt_national_id_back(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.NATIONAL_ID_BACK, fields) + _extras_rule() + r"""
     Document-specific rules:
     - "permanent_address": exact text; if multi-line, join with a single space.
@@ -172,7 +172,7 @@ def prompt_national_id_back(fields: List[str]) -> str:
     """
 
 
-def prompt_government_document(fields: List[str]) -> str:
+def prompt_government_document(fields: Sequence[str]) -> str:
     return _json_envelope_intro(DocumentType.GOVERNMENT_DOCUMENT, fields) + _extras_rule() + """
     Document-specific rules:
     - This is a generic government document prompt combining common fields.
@@ -182,6 +182,20 @@ def prompt_government_document(fields: List[str]) -> str:
     """
 
 
+# One dict probe instead of an if-chain of enum comparisons
+_JSON_PROMPT_BUILDERS = {
+    DocumentType.CTZN_FRONT: prompt_ctzn_front,
+    DocumentType.CTZN_BACK: prompt_ctzn_back,
+    DocumentType.VOTER_ID: prompt_voter_id,
+    DocumentType.LICENSE: prompt_license,
+    DocumentType.PASSPORT_FRONT: prompt_passport_front,
+    DocumentType.PASSPORT_BACK: prompt_passport_back,
+    DocumentType.NATIONAL_ID_FRONT: prompt_national_id_front,
+    DocumentType.NATIONAL_ID_BACK: prompt_national_id_back,
+    DocumentType.GOVERNMENT_DOCUMENT: prompt_government_document,
+}
+
+
 # --------- Plain-text prompts for non-JSON docs ----------
 
 def _plain_text_for(document_type: DocumentType, document_format: DocumentFormat, custom_prompt: Optional[str]) -> str:
@@ -311,24 +325,9 @@ def create_extraction_prompt(
     # JSON path for structured government/ID-like documents
     fields = _fields_list_for(document_type)
     if fields:
-        if document_type == DocumentType.CTZN_FRONT:
-            return prompt_ctzn_front(fields)
-        if document_type == DocumentType.CTZN_BACK:
-            return prompt_ctzn_back(fields)
-        if document_type == DocumentType.VOTER_ID:
-            return prompt_voter_id(fields)
-        if document_type == DocumentType.LICENSE:
-            return prompt_license(fields)
-        if document_type == DocumentType.PASSPORT_FRONT:
-            return prompt_passport_front(fields)
-        if document_type == DocumentType.PASSPORT_BACK:
-            return prompt_passport_back(fields)
-        if document_type == DocumentType.NATIONAL_ID_FRONT:
-            return prompt_national_id_front(fields)
-        if document_type == DocumentType.NATIONAL_ID_BACK:
-            return prompt_national_id_back(fields)
-        if hasattr(DocumentType, "GOVERNMENT_DOCUMENT") and document_type == DocumentType.GOVERNMENT_DOCUMENT:
-            return prompt_government_document(fields)
+        builder = _JSON_PROMPT_BUILDERS.get(document_type)
+        if builder is not None:
+            return builder(fields)
 
         # If some other mapped type exists, still use the generic JSON envelope
         return _json_envelope_intro(document_type, fields) + _extras_rule()
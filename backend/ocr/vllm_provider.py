@@ -1,15 +1,32 @@
 import base64
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 import httpx
 
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
 from backend.config import logger
 from backend.models.enums import DocumentType, DocumentFormat
 from backend.models.mappings import DOCUMENT_FIELD_MAP
 from backend.models.schemas import OCRResult
-from backend.ocr.base import BaseOCRProvider
+from backend.ocr.base import BaseOCRProvider, image_mime_type
+
+# In-flight requests per batch; vLLM's continuous batcher merges whatever is queued server-side
+_BATCH_CONCURRENCY = 16
+# Keep-alive pool sized so a batch's connections are reused by the next one
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=_BATCH_CONCURRENCY)
 
 
 class VLLMProvider(BaseOCRProvider):
@@ -23,13 +40,12 @@ class VLLMProvider(BaseOCRProvider):
         self.client: Optional[httpx.Client] = None
         super().__init__(api_key=api_key)
         logger.debug(f"Initialized VLLMProvider with model: {self.__vllm_model}, server: {self.server_url}")
-        self.configure()
 
     def configure(self):
         """Configure the VLLM connection and create HTTPX client"""
         logger.debug(f"Configuring VLLMProvider with model: {self.__vllm_model}")
         try:
-            self.client = httpx.Client(timeout=30.0)
+            self.client = httpx.Client(timeout=30.0, limits=_LIMITS)
             logger.info(f"HTTPX client configured for VLLM model '{self.model}'")
         except Exception as e:
             logger.error(f"Failed to configure HTTPX client: {str(e)}")
@@ -48,28 +64,8 @@ class VLLMProvider(BaseOCRProvider):
         try:
             logger.debug(f"Starting OCR extraction using model: {self.__vllm_model}")
 
-            encoded_image = base64.b64encode(image_data).decode('utf-8')
             prompt = self._create_extraction_prompt(document_type, document_format, custom_prompt)
-
-            payload = {
-                "model": self.__vllm_model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{encoded_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                "temperature": 0.1,
-                "top_p": 0.9
-            }
+            payload = self._build_payload(prompt, image_data)
 
             # Fixed URL construction
             url = f"{self.server_url}/v1/chat/completions"
@@ -85,7 +81,7 @@ class VLLMProvider(BaseOCRProvider):
             logger.debug(f"Model in payload: {payload.get('model')}")
             logger.debug(f"Request headers: {headers}")
 
-            response = self.client.post(url, json=payload, headers=headers)
+            response = self.client.post(url, content=_json_dumps(payload), headers=headers)
 
             # Log response details before raising for status
             logger.debug(f"Response status: {response.status_code}")
@@ -95,19 +91,8 @@ class VLLMProvider(BaseOCRProvider):
 
             response.raise_for_status()
 
-            raw_text = response.json()["choices"][0]["message"]["content"]
-
-            structured_data = {}
-            if document_type in DOCUMENT_FIELD_MAP:
-                parsed_data = self._parse_structured_response(raw_text, document_type)
-                structured_data = parsed_data if parsed_data else {}
-
-            return OCRResult(
-                raw_text=raw_text,
-                structured_data=structured_data,
-                provider_used=f"vllm:{self.__vllm_model}",
-                language_detected="auto_detected"
-            )
+            raw_text = _json_loads(response.content)["choices"][0]["message"]["content"]
+            return self._to_result(raw_text, document_type)
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error during VLLM OCR request: {e}")
@@ -116,6 +101,54 @@ class VLLMProvider(BaseOCRProvider):
             logger.error(f"Unexpected error during VLLM OCR extraction: {e}")
             raise
 
+    def extract_text_batch(self, images: List[bytes], document_type: DocumentType,
+                           document_format: DocumentFormat,
+                           custom_prompt: Optional[str] = None) -> List[OCRResult]:
+        """
+        OCR several images concurrently over the pooled client so the server can batch them;
+        results keep input order. Plain threads, so it is safe to call from any context.
+        """
+        if len(images) <= 1:
+            return [self.extract_text(image, document_type, document_format, custom_prompt) for image in images]
+        with ThreadPoolExecutor(max_workers=min(_BATCH_CONCURRENCY, len(images))) as pool:
+            return list(pool.map(
+                lambda image: self.extract_text(image, document_type, document_format, custom_prompt), images))
+
+    def _build_payload(self, prompt: str, image_data: bytes) -> Dict[str, Any]:
+        encoded_image = base64.b64encode(image_data).decode('utf-8')
+        return {
+            "model": self.__vllm_model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:{image_mime_type(image_data)};base64,{encoded_image}"
+                            }
+                        }
+                    ]
+                }
+            ],
+            "temperature": 0.1,
+            "top_p": 0.9
+        }
+
+    def _to_result(self, raw_text: str, document_type: DocumentType) -> OCRResult:
+        structured_data = {}
+        if document_type in DOCUMENT_FIELD_MAP:
+            parsed_data = self._parse_structured_response(raw_text, document_type)
+            structured_data = parsed_data if parsed_data else {}
+
+        return OCRResult(
+            raw_text=raw_text,
+            structured_data=structured_data,
+            provider_used=f"vllm:{self.__vllm_model}",
+            language_detected="auto_detected"
+        )
+
     @staticmethod
     def _parse_structured_response(response_text: str, document_type: DocumentType) -> Optional[Dict[str, Any]]:
         """Parse and validate structured JSON response"""
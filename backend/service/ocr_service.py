@@ -92,6 +92,7 @@ class OCRService:
                 max_pdf_pages=request.max_pdf_pages,
                 pdf_dpi=request.pdf_dpi,
                 custom_prompt=request.custom_prompt,
+                include_page_images=False,  # only structured_data is returned
                 **provider_config
             )
             response = response['structured_json']['structured_data']
@@ -576,7 +576,7 @@ def dynamic_preprocess_image(image_bytes, preprocessing_options=None):
     """
     import time
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     image = Image.open(io.BytesIO(image_bytes))
     original_mode = image.mode
@@ -612,7 +612,7 @@ def dynamic_preprocess_image(image_bytes, preprocessing_options=None):
     processed_image.save(byte_io, format='JPEG', quality=92, optimize=True)
     byte_io.seek(0)
 
-    processing_time = (time.time() - start_time) * 1000  # ms
+    processing_time = (time.perf_counter() - start_time) * 1000  # ms
     report = {
         'quality_score': analysis['quality_score'],
         'document_type': analysis['document_type']['type'],
@@ -0,0 +1,31 @@
+from backend.utils.cache import LRUCache, request_cache_key
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_overwrite_refreshes_entry():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_request_cache_key_depends_on_fields_and_payloads():
+    key = request_cache_key({"m": "hi", "t": 0.3}, ["QUJD", "REVG"])
+    assert key == request_cache_key({"t": 0.3, "m": "hi"}, ["QUJD", "REVG"])
+    assert key != request_cache_key({"m": "hi", "t": 0.4}, ["QUJD", "REVG"])
+    assert key != request_cache_key({"m": "hi", "t": 0.3}, ["REVG", "QUJD"])
+    # payload boundaries matter, not just their concatenation
+    assert key != request_cache_key({"m": "hi", "t": 0.3}, ["QUJDREVG"])
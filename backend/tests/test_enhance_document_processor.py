@@ -0,0 +1,74 @@
+import random
+
+from backend.document_content.enhance_document_processor import FastAPIDocumentProcessor
+
+_get_json_depth = FastAPIDocumentProcessor._get_json_depth
+_summarize_json_fields = FastAPIDocumentProcessor._summarize_json_fields
+
+
+# Recursive reference implementation the iterative version must agree with
+def _depth_reference(obj, depth=0):
+    if depth > 10:
+        return depth
+    if isinstance(obj, dict):
+        return max([_depth_reference(v, depth + 1) for v in obj.values()] + [depth])
+    if isinstance(obj, list):
+        return max([_depth_reference(item, depth + 1) for item in obj] + [depth])
+    return depth
+
+
+def _random_json(rng, depth=0):
+    kind = rng.choice(["dict", "list", "scalar"] if depth < 14 else ["scalar"])
+    if kind == "dict":
+        return {f"k{i}": _random_json(rng, depth + 1) for i in range(rng.randint(0, 3))}
+    if kind == "list":
+        return [_random_json(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return rng.choice([None, 1, 2.5, "text", "2024-01-31", "1/2/2024"])
+
+
+def test_get_json_depth_counts_nesting():
+    assert _get_json_depth("text") == 0
+    assert _get_json_depth({}) == 0
+    assert _get_json_depth({"a": 1}) == 1
+    assert _get_json_depth({"a": [{"b": 1}]}) == 3
+
+
+def test_get_json_depth_stops_past_limit():
+    data = leaf = {}
+    for _ in range(50):
+        leaf["n"] = {}
+        leaf = leaf["n"]
+    assert _get_json_depth(data) == 11
+
+
+def test_get_json_depth_matches_recursive_reference():
+    rng = random.Random(3)
+    for _ in range(300):
+        data = _random_json(rng)
+        assert _get_json_depth(data) == _depth_reference(data)
+
+
+def test_summarize_json_fields_classifies_and_limits_depth():
+    data = {
+        "name": "Ram",
+        "dob": "2024-01-31",
+        "issued": "12/05/2070",
+        "age": 30,
+        "tags": ["a", "b"],
+        "address": {"district": "Kathmandu", "ward": 4, "geo": {"lat": 27.7}},
+        "note": "last",
+    }
+    assert _summarize_json_fields(data) == {
+        "Text Fields": ["name", "address.district", "note"],
+        "Number Fields": ["age", "address.ward", "address.geo.lat"],
+        "Date Fields": ["dob", "issued"],
+        "List Fields": ["tags (2 items)"],
+        "Object Fields": ["address", "address.geo"],
+    }
+
+
+def test_summarize_json_fields_does_not_descend_past_two_levels():
+    data = {"a": {"b": {"c": {"d": 1}}}}
+    summary = _summarize_json_fields(data)
+    assert summary["Object Fields"] == ["a", "a.b", "a.b.c"]
+    assert summary["Number Fields"] == []
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from backend.correction.gemini_opensource_corrector import GeminiOpensourceCorrectionProvider, _split_segments
+from backend.models.enums import DocumentFormat, DocumentType, Language
+
+
+class _FakeClient:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text=self.replies.pop(0))
+
+
+def _provider(replies):
+    provider = GeminiOpensourceCorrectionProvider.__new__(GeminiOpensourceCorrectionProvider)
+    provider._GeminiOpensourceCorrectionProvider__gemini_model = "models/test"
+    provider.client = _FakeClient(replies)
+    return provider
+
+
+def test_split_segments_cleans_each_part():
+    response = "---SEG 0---\nCorrected Text: first\n---SEG 1---\nHere is the corrected text:\nsecond\n"
+    assert _split_segments(response, [0, 1]) == {0: "first", 1: "second"}
+
+
+def test_split_segments_ignores_preamble_and_marker_padding():
+    response = "Sure!\n  ---SEG 3---  \nthree\n---SEG 4---\nfour"
+    assert _split_segments(response, [3, 4]) == {3: "three", 4: "four"}
+
+
+def test_split_segments_rejects_missing_segment():
+    assert _split_segments("---SEG 0---\nonly one", [0, 1]) is None
+
+
+def test_split_segments_rejects_duplicate_segment():
+    assert _split_segments("---SEG 0---\na\n---SEG 0---\nb", [0, 1]) is None
+    assert _split_segments("---SEG 0---\na\n---SEG 0---\nb\n---SEG 1---\nc", [0, 1]) is None
+
+
+def test_split_segments_rejects_unexpected_segment():
+    assert _split_segments("---SEG 0---\na\n---SEG 7---\nb", [0, 1]) is None
+
+
+def test_correct_batch_packs_small_segments_into_one_request():
+    provider = _provider(["---SEG 0---\nCorrected Text: A\n---SEG 1---\nB"])
+    result = provider.correct_batch(["a", "b"], DocumentType.GENERAL, DocumentFormat.PRINTED,
+                                    Language.ENGLISH)
+    assert result == ["A", "B"]
+    assert len(provider.client.prompts) == 1
+
+
+def test_correct_batch_falls_back_per_text_on_marker_mismatch():
+    provider = _provider(["---SEG 0---\nA", "Corrected Text: A", "B"])
+    result = provider.correct_batch(["a", "b"], DocumentType.GENERAL, DocumentFormat.PRINTED,
+                                    Language.ENGLISH)
+    assert result == ["A", "B"]
+    assert len(provider.client.prompts) == 3
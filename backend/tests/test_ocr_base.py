@@ -0,0 +1,48 @@
+from backend.models.enums import DocumentFormat, DocumentType
+from backend.models.schemas import OCRResult
+from backend.ocr.base import BaseOCRProvider, image_mime_type
+
+
+class _ScriptedProvider(BaseOCRProvider):
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+        super().__init__(api_key="")
+
+    def configure(self):
+        pass
+
+    def extract_text(self, image_data, document_type, document_format, custom_prompt=None):
+        self.calls += 1
+        return OCRResult(raw_text=self.replies.pop(0))
+
+
+def _ocr(provider, image=b"image"):
+    return provider.extract_text_cached(image, DocumentType.GENERAL, DocumentFormat.PRINTED)
+
+
+def test_extract_text_cached_reuses_successful_result():
+    provider = _ScriptedProvider(["text"])
+    first = _ocr(provider)
+    first.raw_text = "modified by caller"
+    assert _ocr(provider).raw_text == "text"
+    assert provider.calls == 1
+
+
+def test_extract_text_cached_keys_on_image_content():
+    provider = _ScriptedProvider(["one", "two"])
+    assert _ocr(provider, b"a").raw_text == "one"
+    assert _ocr(provider, b"b").raw_text == "two"
+
+
+def test_extract_text_cached_skips_empty_results():
+    provider = _ScriptedProvider(["  ", "text"])
+    assert _ocr(provider).raw_text == "  "
+    assert _ocr(provider).raw_text == "text"
+    assert provider.calls == 2
+
+
+def test_image_mime_type_sniffs_magic_numbers():
+    assert image_mime_type(b"\x89PNG\r\n\x1a\n....") == "image/png"
+    assert image_mime_type(b"RIFF\0\0\0\0WEBPVP8 ") == "image/webp"
+    assert image_mime_type(b"\xff\xd8\xff\xe0") == "image/jpeg"
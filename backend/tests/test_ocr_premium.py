@@ -0,0 +1,100 @@
+import random
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from backend.app.api.v1.endpoints.ocr_premium import _flatten_dict, _prune_none_deep
+
+
+# Recursive reference implementations the iterative versions must agree with
+def _prune_reference(obj):
+    if isinstance(obj, Mapping):
+        out = {}
+        for k, v in obj.items():
+            pv = _prune_reference(v)
+            if pv is not None:
+                out[k] = pv
+        return out
+    if isinstance(obj, list):
+        return [_prune_reference(v) for v in obj if v is not None]
+    return obj
+
+
+def _flatten_reference(d, parent="", sep="."):
+    out = {}
+    for k, v in d.items():
+        key = f"{parent}{sep}{k}" if parent else str(k)
+        if isinstance(v, Mapping):
+            out.update(_flatten_reference(v, key, sep))
+        elif isinstance(v, list):
+            for i, item in enumerate(v):
+                if isinstance(item, Mapping):
+                    out.update(_flatten_reference(item, f"{key}[{i}]", sep))
+                else:
+                    out[f"{key}[{i}]"] = item
+        else:
+            out[key] = v
+    return out
+
+
+def _random_json(rng, depth=0):
+    kind = rng.choice(["dict", "list", "scalar"] if depth < 5 else ["scalar"])
+    if kind == "dict":
+        return {f"k{i}": _random_json(rng, depth + 1) for i in range(rng.randint(0, 4))}
+    if kind == "list":
+        return [_random_json(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return rng.choice([None, 0, 1.5, False, True, "", "text", [], {}])
+
+
+def test_prune_none_deep_keeps_falsy_values_and_order():
+    data = {"a": None, "b": 0, "c": {"d": None, "e": ""}, "f": [None, False, {"g": None}, []], "h": {}}
+    pruned = _prune_none_deep(data)
+    assert pruned == {"b": 0, "c": {"e": ""}, "f": [False, {}, []], "h": {}}
+    assert list(pruned) == ["b", "c", "f", "h"]
+    assert data["a"] is None  # input is not modified
+
+
+def test_prune_none_deep_accepts_mappings_and_scalars():
+    assert _prune_none_deep(MappingProxyType({"a": None, "b": 1})) == {"b": 1}
+    assert _prune_none_deep(None) is None
+    assert _prune_none_deep("text") == "text"
+
+
+def test_prune_none_deep_handles_deep_nesting():
+    data = leaf = {}
+    for _ in range(5000):  # deeper than the default recursion limit
+        leaf["next"] = {"drop": None}
+        leaf = leaf["next"]
+    pruned = _prune_none_deep(data)
+    for _ in range(5000):
+        pruned = pruned["next"]
+    assert pruned == {}
+
+
+def test_prune_none_deep_matches_recursive_reference():
+    rng = random.Random(7)
+    for _ in range(300):
+        data = _random_json(rng)
+        assert _prune_none_deep(data) == _prune_reference(data)
+
+
+def test_flatten_dict_keys_and_order():
+    data = {"a": 1, "b": {"c": 2, "d": [3, {"e": 4}, [5]]}, "f": {}}
+    flat = _flatten_dict(data)
+    assert flat == {"a": 1, "b.c": 2, "b.d[0]": 3, "b.d[1].e": 4, "b.d[2]": [5]}
+    assert list(flat) == ["a", "b.c", "b.d[0]", "b.d[1].e", "b.d[2]"]
+
+
+def test_flatten_dict_fast_path_stringifies_keys():
+    assert _flatten_dict({1: "a", "b": None}) == {"1": "a", "b": None}
+
+
+def test_flatten_dict_parent_and_separator():
+    assert _flatten_dict({"a": {"b": 1}}, parent="root", sep="/") == {"root/a/b": 1}
+
+
+def test_flatten_dict_matches_recursive_reference():
+    rng = random.Random(11)
+    for _ in range(300):
+        data = _random_json(rng)
+        if isinstance(data, dict):
+            assert list(_flatten_dict(data).items()) == list(_flatten_reference(data).items())
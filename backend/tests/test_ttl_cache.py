@@ -0,0 +1,79 @@
+import threading
+import time
+
+from backend.utils import cache as cache_module
+from backend.utils.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = TTLCache(ttl_seconds=10)
+    cache.set("k", "v")
+    clock.now += 10
+    assert cache.get("k") == "v"
+    clock.now += 0.5
+    assert cache.get("k") is None
+
+
+def test_get_or_set_computes_once_and_caches():
+    cache = TTLCache(ttl_seconds=60)
+    calls = []
+    assert cache.get_or_set("k", lambda: calls.append(1) or "v") == "v"
+    assert cache.get_or_set("k", lambda: calls.append(1) or "other") == "v"
+    assert len(calls) == 1
+
+
+def test_get_or_set_single_flight_under_concurrency():
+    cache = TTLCache(ttl_seconds=60)
+    calls = []
+    release = threading.Event()
+
+    def factory():
+        calls.append(1)
+        release.wait(5)
+        return "v"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_set("k", factory))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)  # let the followers queue up behind the leader
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert results == ["v"] * 8
+    assert len(calls) == 1
+
+
+def test_get_or_set_leader_failure_releases_waiters():
+    cache = TTLCache(ttl_seconds=60)
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    try:
+        cache.get_or_set("k", boom)
+    except RuntimeError:
+        pass
+    # the in-flight marker is cleared, so the next caller computes afresh instead of waiting forever
+    assert cache.get_or_set("k", lambda: "v") == "v"
+
+
+def test_ttl_cache_evicts_least_recently_used_past_maxsize():
+    cache = TTLCache(ttl_seconds=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
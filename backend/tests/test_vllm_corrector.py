@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.correction import vllm_corrector
+from backend.correction.vllm_corrector import VLLMCorrectionProvider, _backoff, _is_retryable
+from backend.models.enums import DocumentFormat, DocumentType, Language
+
+_ARGS = (DocumentType.GENERAL, DocumentFormat.PRINTED, Language.ENGLISH)
+
+
+class _Server:
+    """Scripted vLLM endpoint: /models lists the model, /chat/completions answers from `statuses`."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.completions = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={"data": [{"id": "test-model"}]})
+        self.completions += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return httpx.Response(status)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Corrected Text: fixed"}}]})
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def make_provider(monkeypatch):
+    monkeypatch.setattr(vllm_corrector, "_backoff", lambda attempt: 0.0)
+
+    def make(server):
+        transport = httpx.MockTransport(server)
+        clients = (httpx.Client(transport=transport, base_url="http://vllm/v1"),
+                   httpx.AsyncClient(transport=transport, base_url="http://vllm/v1"))
+        monkeypatch.setattr(vllm_corrector, "_get_clients", lambda server_url, api_key: clients)
+        return VLLMCorrectionProvider(api_key="", model="test-model", server_url="http://vllm/v1")
+
+    return make
+
+
+def test_backoff_is_full_jitter_within_cap():
+    for attempt in range(8):
+        cap = min(vllm_corrector._BACKOFF_MAX, vllm_corrector._BACKOFF_BASE * 2 ** attempt)
+        assert all(0 <= _backoff(attempt) <= cap for _ in range(50))
+
+
+def test_is_retryable_covers_backpressure_and_transport_errors():
+    request = httpx.Request("POST", "http://vllm/v1/chat/completions")
+
+    def status_error(code):
+        return httpx.HTTPStatusError("", request=request, response=httpx.Response(code, request=request))
+
+    assert _is_retryable(status_error(503))
+    assert _is_retryable(status_error(429))
+    assert not _is_retryable(status_error(400))
+    assert _is_retryable(httpx.ConnectError("refused", request=request))
+
+
+def test_correct_text_retries_backpressure(make_provider):
+    server = _Server([503, 429])
+    provider = make_provider(server)
+    assert provider.correct_text("raw", *_ARGS) == "fixed"
+    assert server.completions == 3
+
+
+def test_correct_text_does_not_retry_client_errors(make_provider):
+    server = _Server([400])
+    provider = make_provider(server)
+    assert provider.correct_text("raw", *_ARGS) == "raw"
+    assert server.completions == 1
+
+
+def test_correct_text_gives_up_after_retry_budget(make_provider):
+    server = _Server([503] * 10)
+    provider = make_provider(server)
+    assert provider.correct_text("raw", *_ARGS) == "raw"
+    assert server.completions == vllm_corrector._RETRY_ATTEMPTS
+
+
+def test_breaker_opens_after_threshold_and_closes_after_cooldown(make_provider, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(vllm_corrector.time, "monotonic", clock)
+    server = _Server([400] * vllm_corrector._BREAKER_THRESHOLD)
+    provider = make_provider(server)
+
+    for i in range(vllm_corrector._BREAKER_THRESHOLD):
+        assert provider.correct_text(f"raw {i}", *_ARGS) == f"raw {i}"
+    calls = server.completions
+
+    # open: the server is skipped and the input comes back unchanged
+    assert provider.correct_text("skipped", *_ARGS) == "skipped"
+    assert server.completions == calls
+
+    clock.now += vllm_corrector._BREAKER_COOLDOWN + 1
+    assert provider.correct_text("after cooldown", *_ARGS) == "fixed"
+    assert server.completions == calls + 1
+
+
+def test_success_resets_failure_count(make_provider):
+    threshold = vllm_corrector._BREAKER_THRESHOLD
+    server = _Server([400] * (threshold - 1) + [200] + [400] * (threshold - 1))
+    provider = make_provider(server)
+    for i in range(2 * threshold - 1):
+        provider.correct_text(f"raw {i}", *_ARGS)
+    assert not provider._breaker_open()
+
+
+def test_correct_text_async_retries_backpressure(make_provider):
+    server = _Server([502])
+    provider = make_provider(server)
+    assert asyncio.run(provider.correct_text_async("raw", *_ARGS)) == "fixed"
+    assert server.completions == 2
+
+
+def test_cached_correction_skips_server_on_both_paths(make_provider):
+    server = _Server([])
+    provider = make_provider(server)
+    assert provider.correct_text("raw", *_ARGS) == "fixed"
+    assert asyncio.run(provider.correct_text_async("raw", *_ARGS)) == "fixed"
+    assert server.completions == 1
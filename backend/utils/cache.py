@@ -0,0 +1,106 @@
+"""
+In-process caches shared by the API endpoints and the OCR and correction providers.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+class LRUCache:
+    """Small thread-safe LRU map for memoizing provider responses in-process."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            val = self._data.get(key)
+            if val is not None:
+                self._data.move_to_end(key)
+            return val
+
+    def set(self, key: Hashable, val: Any) -> None:
+        with self._lock:
+            self._data[key] = val
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class TTLCache:
+    """TTL cache with LRU eviction once `maxsize` entries are held."""
+
+    def __init__(self, ttl_seconds: int = 180, maxsize: int = 256) -> None:
+        self.ttl = ttl_seconds
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+
+    def _get_locked(self, key: str) -> Optional[Any]:
+        hit = self._data.get(key)
+        if not hit:
+            return None
+        ts, val = hit
+        if time.monotonic() - ts > self.ttl:
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return val
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._get_locked(key)
+
+    def set(self, key: str, val: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), val)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached value or compute it with `factory`.
+        Concurrent misses on the same key wait for the first caller instead of stampeding upstream.
+        """
+        with self._lock:
+            val = self._get_locked(key)
+            if val is not None:
+                return val
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+
+        if not leader:
+            event.wait()
+            val = self.get(key)
+            return val if val is not None else factory()
+
+        try:
+            val = factory()
+            self.set(key, val)
+            return val
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+
+def request_cache_key(fields: Dict[str, Any], payloads: Iterable[str] = ()) -> str:
+    """
+    Response-cache key for an API request. The small fields are hashed as compact JSON; large
+    payload strings (base64 files, long texts) are digested one by one straight from the string,
+    so the request is never re-serialized as a whole.
+    """
+    h = hashlib.blake2b(json.dumps(fields, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8"),
+                        digest_size=16)
+    for payload in payloads:
+        h.update(hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest())
+    return h.hexdigest()
@@ -63,11 +63,11 @@ def timing(description):
             self.description = description
 
         def __enter__(self):
-            self.start_time = time.time()
+            self.start_time = time.perf_counter()
             return self
 
         def __exit__(self, exc_type, exc_val, exc_tb):
-            end_time = time.time()
+            end_time = time.perf_counter()
             execution_time = end_time - self.start_time
             logger.info(f"{self.description} took {execution_time:.2f} seconds")
             return False
@@ -5,6 +5,8 @@ Uses document_content-aware adaptive segmentation for improved results across do
 """
 
 import base64
+import io
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, Union, Optional
 
@@ -17,29 +19,37 @@ from backend.utils.helper.image_utils import estimate_text_density
 from backend.utils.helper.text_utils import detect_content_regions
 
 
-def segment_image_for_ocr(image_path: Union[str, Path], vision_enabled: bool = True, preserve_content: bool = True) -> \
-        Dict[str, Union[Image.Image, str]]:
+def segment_image_for_ocr(image_path: Union[str, Path, bytes, Image.Image], vision_enabled: bool = True,
+                          preserve_content: bool = True) -> Dict[str, Union[Image.Image, str]]:
     """
     Prepare image for OCR processing using document_content-aware segmentation.
     Uses adaptive region detection based on text density analysis.
 
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, the encoded image bytes, or an already-decoded PIL image
         vision_enabled: Whether the vision model is enabled
         preserve_content: Whether to preserve original document_content without enhancement
 
     Returns:
         Dict containing segmentation results
     """
-    # Convert to Path object if string
-    image_file = Path(image_path) if isinstance(image_path, str) else image_path
+    # In-memory images are read straight from a buffer (or used as-is), no temp file needed
+    if isinstance(image_path, Image.Image):
+        image_source, image_name = image_path, "<in-memory image>"
+    elif isinstance(image_path, bytes):
+        image_source, image_name = io.BytesIO(image_path), "<in-memory image>"
+    else:
+        # Convert to Path object if string
+        image_source = Path(image_path) if isinstance(image_path, str) else image_path
+        image_name = image_source.name
 
     # Log start of processing
-    logger.info(f"Preparing image for Mistral OCR: {image_file.name}")
+    logger.info(f"Preparing image for Mistral OCR: {image_name}")
 
     try:
-        # Open original image with PIL
-        with Image.open(image_file) as pil_img:
+        # Open original image with PIL; caller-owned PIL images are used directly and left open
+        image_ctx = nullcontext(image_source) if isinstance(image_source, Image.Image) else Image.open(image_source)
+        with image_ctx as pil_img:
             # Check for low entropy images when vision is disabled
             if not vision_enabled:
                 from backend.utils.helper.image_utils import calculate_image_entropy
@@ -165,11 +175,16 @@ def segment_image_for_ocr(image_path: Union[str, Path], vision_enabled: bool = T
                 }
 
     except Exception as e:
-        logger.error(f"Error segmenting image {image_file.name}: {str(e)}")
+        logger.error(f"Error segmenting image {image_name}: {str(e)}")
         # Return None values if processing fails
         return {}
 
 
+def segment_image_for_ocr_bytes(image_bytes: bytes, vision_enabled: bool = True) -> Dict[str, Union[Image.Image, str]]:
+    """Segment an encoded image held in memory (e.g. an upload or a rendered PDF page)."""
+    return segment_image_for_ocr(image_bytes, vision_enabled=vision_enabled)
+
+
 def process_segmented_image(image_path: Union[str, Path], output_dir: Optional[Path] = None) -> Dict:
     """
     Process an image using segmentation for improved OCR, saving visualization outputs.
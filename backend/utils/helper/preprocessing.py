@@ -433,7 +433,7 @@ def preprocess_image(image_bytes, preprocessing_options):
         "document_format": preprocessing_options.get("document_format", "STANDARD"),
         "preprocessing_applied": []
     }
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     # Handle RGBA images (transparency) by converting to RGB
     if image.mode == 'RGBA':
@@ -508,7 +508,7 @@ def preprocess_image(image_bytes, preprocessing_options):
         processed_image = Image.fromarray(img_array)
 
     # Record total processing time
-    metrics["processing_time"] = (time.time() - start_time) * 1000  # ms
+    metrics["processing_time"] = (time.perf_counter() - start_time) * 1000  # ms
 
     # Higher quality for OCR processing
     byte_io = io.BytesIO()
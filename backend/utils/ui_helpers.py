@@ -7,7 +7,6 @@ from mistralai import Mistral, ImageURLChunk, TextChunk
 from backend.core.config import settings
 from backend.models.enums import OCRProvider, CorrectionProvider, Language, StructuredOCRResult
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 